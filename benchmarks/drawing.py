@@ -0,0 +1,232 @@
+"""
+Drawing and widgets benchmark for PyGameEngine.
+
+Runs headless(SDL dummy driver) and measures, for 10 to 10,000 instances:
+- draw_rect(opaque and with alpha), draw_circle, draw_text;
+- a SpriteBatch where 1% of the sprites move each frame;
+- draw_widgets with all the widget types mixed;
+- each widget class alone.
+
+For each case it reports frames per second and the memory allocated while drawing
+(peak and retained after the frames, tracemalloc).
+
+Usage:
+    python benchmarks/drawing.py
+    python benchmarks/drawing.py --scales 10,100 --cases draw_rect,Button
+    python benchmarks/drawing.py --save-baseline benchmarks/baseline.json
+    python benchmarks/drawing.py --baseline benchmarks/baseline.json --tolerance 0.25
+
+Exits with 1 if a case is slower(fps) or allocates more than the baseline, beyond the tolerance.
+"""
+import argparse, contextlib, io, json, os, sys, time, tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+os.environ['SDL_AUDIODRIVER'] = 'dummy'
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+os.environ['MAXPYGAME_OFFLINE'] = '1'
+
+import pygameengine as pyge
+
+SCREEN = (1280, 720)
+SCALES = (10, 100, 1000, 10000)
+ALLOC_SLACK_KB = 16 # Small allocations are noise, not regressions
+
+def grid(i:int, n:int, cell:tuple[int,int]=(40, 24)) -> tuple[int,int]:
+    # Spread n things over the screen
+    cols = max(1, SCREEN[0] // cell[0])
+    return ((i % cols) * cell[0] % SCREEN[0], (i // cols) * cell[1] % SCREEN[1])
+
+# Cases, each one returns the function that draws a frame
+def case_draw_rect(engine, n):
+    color = engine.Colors.RED
+    positions = [grid(i, n) for i in range(n)]
+    def frame():
+        for pos in positions:
+            engine.draw_rect(pos, (30, 18), color)
+    return frame
+
+def case_draw_rect_alpha(engine, n):
+    color = engine.Colors.RED
+    positions = [grid(i, n) for i in range(n)]
+    def frame():
+        for pos in positions:
+            engine.draw_rect(pos, (30, 18), color, alpha=128)
+    return frame
+
+def case_draw_circle(engine, n):
+    color = engine.Colors.GREEN
+    positions = [grid(i, n) for i in range(n)]
+    def frame():
+        for pos in positions:
+            engine.draw_circle(pos, 10, color)
+    return frame
+
+def case_draw_text(engine, n):
+    font = engine.createFont(None, 16)
+    color = engine.Colors.WHITE
+    items = [(grid(i, n), f'Text {i % 100}') for i in range(n)]
+    def frame():
+        for pos, text in items:
+            engine.draw_text(pos, text, font, color)
+    return frame
+
+def case_sprite_batch(engine, n):
+    # Sprites on a background, 1% of them move each frame
+    screen = engine.getScreen()
+    background = pyge.pg.Surface(SCREEN)
+    background.fill((20, 20, 40))
+    image = pyge.pg.Surface((16, 16))
+    image.fill((200, 80, 80))
+    sprites = []
+    for i in range(n):
+        sprite = pyge.pg.sprite.DirtySprite()
+        sprite.image = image
+        sprite.rect = image.get_rect(topleft=grid(i, n, (20, 20)))
+        sprites.append(sprite)
+    batch = engine.createSpriteBatch(background)
+    batch.add(*sprites)
+    moving = sprites[::100]
+    step = [1]
+    def frame():
+        step[0] = -step[0]
+        for sprite in moving:
+            sprite.rect.x += step[0]
+            sprite.dirty = 1
+        engine.draw_sprites(batch, screen)
+    return frame
+
+def widget_factory(name:str):
+    def make(engine, i, n, font):
+        pos = grid(i, n, (64, 40))
+        colors = [engine.Colors.WHITE, engine.Colors.DARKGRAY, engine.Colors.LIGHTGRAY, engine.Colors.RED]
+        if name == 'Button':
+            return pyge.Button(engine, pos, font, 'Button', colors[:3])
+        elif name == 'Checkbox':
+            return pyge.Checkbox(engine, pos, font, 'Check', colors)
+        elif name == 'Slider':
+            return pyge.Slider(engine, pos, (50, 10), colors, value=(i % 10) / 10)
+        elif name == 'Select':
+            return pyge.Select(engine, pos, font, colors[:3], ['a', 'bb', 'ccc'])
+        elif name == 'Longtext':
+            return pyge.Longtext(engine, pos, font, 'Long text widget', colors[:3], size=(60, 36))
+        elif name == 'Progressbar':
+            return pyge.Progressbar(engine, pos, (50, 10), colors, value=(i % 10) / 10, text='50%', font=font)
+        elif name == 'Textbox':
+            return pyge.Textbox(engine, pos, 16, colors, font, 'Text')
+    return make
+
+WIDGETS = ('Button', 'Checkbox', 'Slider', 'Select', 'Longtext', 'Progressbar', 'Textbox')
+
+def case_widgets(names:tuple[str,]):
+    def case(engine, n):
+        font = engine.createFont(None, 16)
+        makers = [widget_factory(name) for name in names]
+        for i in range(n):
+            makers[i % len(makers)](engine, i, n, font)
+        return engine.draw_widgets
+    return case
+
+CASES = {
+    'draw_rect': case_draw_rect,
+    'draw_rect_alpha': case_draw_rect_alpha,
+    'draw_circle': case_draw_circle,
+    'draw_text': case_draw_text,
+    'sprite_batch': case_sprite_batch,
+    'draw_widgets': case_widgets(WIDGETS),
+}
+CASES.update({name: case_widgets((name,)) for name in WIDGETS})
+
+def measure(engine, case, n:int, min_time:float, min_frames:int) -> dict:
+    black = engine.Colors.BLACK
+    frame = case(engine, n)
+    def run_frame():
+        engine.fill(black)
+        frame()
+        engine.update()
+
+    for _ in range(3): # Warm up(caches, widgets composed)
+        run_frame()
+
+    frames = 0
+    start = time.perf_counter()
+    while frames < min_frames or time.perf_counter() - start < min_time:
+        run_frame()
+        frames += 1
+    elapsed = time.perf_counter() - start
+
+    alloc_frames = 3
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    for _ in range(alloc_frames):
+        run_frame()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    engine.clearWidgets() # Next case starts empty
+    return {
+        'fps': frames / elapsed,
+        'ms': elapsed / frames * 1000,
+        'peak_kb': (peak - base) / 1024,
+        'retained_kb': max(0, current - base) / 1024 / alloc_frames,
+    }
+
+def compare(results:dict, baseline:dict, tolerance:float) -> list[str,]:
+    problems = []
+    for key, result in results.items():
+        old = baseline.get(key)
+        if old is None:
+            continue
+        if result['fps'] < old['fps'] * (1 - tolerance):
+            problems.append(f'{key}: {result["fps"]:.1f} fps, baseline {old["fps"]:.1f} fps')
+        for metric in ('peak_kb', 'retained_kb'):
+            if result[metric] > old[metric] * (1 + tolerance) + ALLOC_SLACK_KB:
+                problems.append(f'{key}: {metric} {result[metric]:.1f}, baseline {old[metric]:.1f}')
+    return problems
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Measure drawing and widgets performance headless.')
+    parser.add_argument('--scales', default=','.join(map(str, SCALES)), help='Numbers of instances, comma separated')
+    parser.add_argument('--cases', default=','.join(CASES), help='Cases, comma separated: ' + ', '.join(CASES))
+    parser.add_argument('--min-time', type=float, default=0.5, help='Seconds measured per case')
+    parser.add_argument('--min-frames', type=int, default=5)
+    parser.add_argument('--baseline', default=None, help='JSON to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed regression, 0.25 = 25%%')
+    parser.add_argument('--save-baseline', default=None, help='Save the results as the new baseline JSON')
+    args = parser.parse_args()
+
+    scales = [int(x) for x in args.scales.split(',')]
+    cases = args.cases.split(',')
+    for name in cases:
+        if name not in CASES:
+            parser.error(f'unknown case {name}')
+
+    with contextlib.redirect_stdout(io.StringIO()): # Engine banner
+        engine = pyge.PyGameEngine(check_updates=False)
+    engine.createScreen(*SCREEN)
+
+    results = {}
+    print(f'{"case":<18}{"n":>7}{"fps":>10}{"ms":>10}{"peak kb":>10}{"kept kb":>10}')
+    for name in cases:
+        for n in scales:
+            result = measure(engine, CASES[name], n, args.min_time, args.min_frames)
+            results[f'{name}@{n}'] = result
+            print(f'{name:<18}{n:>7}{result["fps"]:>10.1f}{result["ms"]:>10.2f}{result["peak_kb"]:>10.1f}{result["retained_kb"]:>10.1f}', flush=True)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(results, f, indent=1)
+        print(f'Baseline saved to {args.save_baseline}')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = compare(results, json.load(f), args.tolerance)
+        for problem in problems:
+            print(f'[!] {problem}')
+        return 1 if problems else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
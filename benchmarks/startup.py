@@ -0,0 +1,64 @@
+"""
+Startup benchmark for PyGameEngine.
+
+Measures, in fresh interpreters (cold imports):
+- import pygame (reference, the floor we can't go under);
+- import pygameengine;
+- PyGameEngine() (headless, no update check).
+
+Usage:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 20 --import-budget 300 --engine-budget 50
+
+Exits with 1 if a median goes over its budget (in milliseconds).
+"""
+import argparse, json, os, statistics, subprocess, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r'''
+import json, time
+t0 = time.perf_counter()
+import pygame
+t1 = time.perf_counter()
+import pygameengine
+t2 = time.perf_counter()
+engine = pygameengine.PyGameEngine(check_updates=False)
+t3 = time.perf_counter()
+print(json.dumps({"pygame": (t1 - t0) * 1000, "import": (t2 - t1) * 1000, "engine": (t3 - t2) * 1000}))
+'''
+
+def run_once() -> dict:
+    env = dict(os.environ)
+    env['SDL_VIDEODRIVER'] = 'dummy'
+    env['SDL_AUDIODRIVER'] = 'dummy'
+    env['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+    env['MAXPYGAME_OFFLINE'] = '1'
+    env['PYTHONPATH'] = ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    out = subprocess.run([sys.executable, '-c', CHILD], env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1]) # Engine banner is printed before
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Measure cold import and engine construction time.')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--import-budget', type=float, default=None, help='Max median ms for import pygameengine (pygame excluded)')
+    parser.add_argument('--engine-budget', type=float, default=None, help='Max median ms for PyGameEngine()')
+    args = parser.parse_args()
+
+    results = [run_once() for _ in range(args.runs)]
+    medians = {}
+    print(f'{"phase":<10}{"min":>10}{"median":>10}{"max":>10}  (ms, {args.runs} runs)')
+    for phase in ('pygame', 'import', 'engine'):
+        values = [r[phase] for r in results]
+        medians[phase] = statistics.median(values)
+        print(f'{phase:<10}{min(values):>10.2f}{medians[phase]:>10.2f}{max(values):>10.2f}')
+
+    failed = False
+    for phase, budget in (('import', args.import_budget), ('engine', args.engine_budget)):
+        if budget is not None and medians[phase] > budget:
+            print(f'[!] {phase} median {medians[phase]:.2f}ms is over the budget of {budget:.2f}ms')
+            failed = True
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
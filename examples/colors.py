@@ -3,6 +3,7 @@ import pygameengine as pyge
 
 # Init PyGameEngine
 pge = pyge.PyGameEngine()
+pge.Colors.load() # Load the full palette now, it's loaded on demand
 
 # Create Screen
 S_W,S_H = (1024,768)
@@ -0,0 +1,44 @@
+# Import PyGameEngine
+import pygameengine as pyge
+
+# Init PyGameEngine
+pge = pyge.PyGameEngine()
+
+# Create Screen
+S_W,S_H = (800,600)
+screen = pge.createScreen(S_W,S_H)
+pge.setScreenTitle("Fixed Timestep")
+
+# Create a font
+arial16 = pge.createSysFont('Arial', 16)
+
+# Ball, the simulation always runs at 60 updates per second
+position = pyge.pg.Vector2(100, 100)
+previous = pyge.pg.Vector2(position)
+velocity = pyge.pg.Vector2(300, 220) # Pixels per second
+RADIUS = 20
+
+def update(dt:float):
+    previous.update(position)
+    position.x += velocity.x * dt
+    position.y += velocity.y * dt
+    if position.x < RADIUS or position.x > S_W - RADIUS:
+        velocity.x *= -1
+    if position.y < RADIUS or position.y > S_H - RADIUS:
+        velocity.y *= -1
+
+def draw(alpha:float):
+    # Draw between the last 2 updates, smooth at any FPS(draw_circle takes the top left corner)
+    pge.draw_circle(previous.lerp(position, alpha) - (RADIUS, RADIUS), RADIUS, pge.Colors.RED)
+    pge.draw_text_fast((0,0), f'FPS: {int(pge.getFPS())} (1-4 to change)', arial16, pge.Colors.WHITE)
+
+def events(events:list):
+    for ev in events:
+        if ev.type == pyge.KEYDOWN:
+            if ev.key == pyge.K_ESCAPE:
+                pge.stop()
+            elif ev.key in (pyge.K_1, pyge.K_2, pyge.K_3, pyge.K_4):
+                pge.setFPS({pyge.K_1: 15, pyge.K_2: 30, pyge.K_3: 144, pyge.K_4: 0}[ev.key])
+
+pge.run(update, draw, events=events, fill_color=pge.Colors.BLACK)
+pge.exit()
@@ -1,17 +1,81 @@
 """
 Main file for PyGameEngine.
+
+Widgets, colors and the networking pieces are loaded on first use (see __getattr__),
+so `import pygameengine` only pays for pygame itself.
 """
+from __future__ import annotations
+import importlib
 
 from .required import *
 from .objects import *
-from .widgets import *
-from .l_colors import Colors as ccc
-from .l_colors import reqColor
+from .objects import color as reqColor
+from .cache import SurfaceCache, ImageCache
+from .shapes import ShapeCache
+from .spatial import SpatialGrid
+from .registry import WidgetRegistry
+from .dispatch import EventDispatcher
+from .timers import TimerWheel, Timer
+from .profiler import FrameProfiler
+
+# Lazy loading
+_lazy:dict[str,tuple[str,str]] = {
+    # Widgets
+    'Widget':('widgets','Widget'),
+    'Button':('widgets','Button'),
+    'Checkbox':('widgets','Checkbox'),
+    'Slider':('widgets','Slider'),
+    'Select':('widgets','Select'),
+    'Longtext':('widgets','Longtext'),
+    'Progressbar':('widgets','Progressbar'),
+    'Textbox':('widgets','Textbox'),
+    # Colors
+    'ccc':('l_colors','Colors'),
+    # Text
+    'FontMetrics':('text','FontMetrics'),
+    'GlyphAtlas':('text','GlyphAtlas'),
+    # Images
+    'TextureAtlas':('atlas','TextureAtlas'),
+    'AtlasRegion':('atlas','AtlasRegion'),
+    'AssetLoader':('assets','AssetLoader'),
+    'SpriteBatch':('sprites','SpriteBatch'),
+    # Networking
+    'UpdateChecker':('network','UpdateChecker'),
+    'fetch_json':('network','fetch_json'),
+    'cache_path':('network','cache_path'),
+    'read_cache':('network','read_cache'),
+    'write_cache':('network','write_cache'),
+    'is_offline':('network','is_offline'),
+}
+_lazy_modules:tuple[str,] = ('widgets','l_colors','network','text','atlas','assets','sprites','palette')
+
+def __getattr__(name:str):
+    """
+    Import the module of a lazy name on first access, then keep it in the globals
+    """
+    if name in _lazy:
+        module_name, attr = _lazy[name]
+        value = getattr(importlib.import_module(f'.{module_name}', __name__), attr)
+    elif name in _lazy_modules:
+        value = importlib.import_module(f'.{name}', __name__)
+    else:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    globals()[name] = value
+    return value
+
+def __dir__() -> list[str,]:
+    return sorted(set(globals().keys()) | set(_lazy.keys()) | set(_lazy_modules))
 
 class PyGameEngine:
     meta:Metadata = Metadata()
     Colors:ccc
     TimeSys:TTimeSys = None
+    update_checker:UpdateChecker = None
+    rect_cache:SurfaceCache = None
+    text_cache:SurfaceCache = None
+    image_cache:ImageCache = None
+    shape_cache:ShapeCache = None
+    glyph_atlases:dict = None
     # PyGame Functions
     screen:pg.SurfaceType=None # Screen
     clock:pg.time.Clock=None # Clock
@@ -19,42 +83,61 @@ class PyGameEngine:
     # Engine Variables
     fps:int=60
     _rfps:float=0
-    widgets:list[Widget,] = []
+    widgets:WidgetRegistry = None
     fonts:list[pg.font.FontType,] = []
     icon:Icon = None
     events:list[pg.event.Event,] = []
+    input:InputState = None
+    widget_index:SpatialGrid = None
+    dispatcher:EventDispatcher = None
+    timers:TimerWheel = None
+    profiler:FrameProfiler = None # Opt-in, see enableProfiler
     
-    def __init__(self,screen:pg.SurfaceType=None):
+    # Run Loop
+    running:bool = False # True while run() is looping
+    
+    # Dirty Rects
+    dirty_mode:bool = False
+    dirty_threshold:float = 0.5 # Part of the screen that makes a full update cheaper
+    
+    def __init__(self,screen:pg.SurfaceType=None, check_updates:bool=True):
+        """
+        Initializes the engine.
+        
+        Parameters:
+            screen(Optional):pg.SurfaceType
+            check_updates(Optional):bool - Check for a new version in background, also disabled by MAXPYGAME_OFFLINE=1
+        Returns:
+            None
+        """
         pg.init()
         print(f"{self.meta.name} - {self.meta.version}\n\t - By {self.meta.author}")
-        try:
-            print(f'\t - [!] Any issues, please go to: {self.meta.github}')
-            data_online = requests.get('https://raw.githubusercontent.com/MrJuaumBR/maxpygame/main/data.json').json()
-            if 'version' in data_online.keys():
-                # Check if metadata version can be converted to int
-                try:
-                    int(self.meta.splitver())
-                    ver = self.meta.splitver2int()
-                    if data_online['version'] > ver:
-                        print(f'\t - [!] New version available, please go to: {self.meta.github}')
-                    elif data_online['version'] < ver:
-                        print(f'\t - [!] You are using an unknown version, please go to: {self.meta.github}')
-                    else:
-                        print(f'\t - Updated version.')
-                except: # Cant convert to int
-                    if 'fix' in self.meta.version:
-                        ver = int(self.meta.splitver().replace('fix',''))
-                        if data_online['version'] > ver:
-                            print(f'\t - [!] New version available, please go to: {self.meta.github}')
-                        elif data_online['version'] < ver:
-                            print(f'\t - [!] You are using an unknown version, please go to: {self.meta.github}')
-                        else:
-                            print(f'\t - Updated version.')
-        except: pass
+        print(f'\t - [!] Any issues, please go to: {self.meta.github}')
+        from .l_colors import Colors
+        from .network import UpdateChecker, is_offline
         self.screen = screen
         self.clock = pg.time.Clock()
-        self.Colors = ccc()
+        self.Colors = Colors()
         self.TimeSys = TTimeSys(self)
+        self.input = InputState.from_events([])
+        self.widgets = WidgetRegistry()
+        self.widget_index = SpatialGrid()
+        self.dispatcher = EventDispatcher(self)
+        self.timers = TimerWheel()
+        self.rect_cache = SurfaceCache(cfgcache.RECT_CACHE_BYTES)
+        self.text_cache = SurfaceCache(cfgcache.TEXT_CACHE_BYTES)
+        self.image_cache = ImageCache(cfgcache.IMAGE_CACHE_BYTES)
+        self.shape_cache = ShapeCache(cfgcache.SHAPE_CACHE_BYTES)
+        self.glyph_atlases = {}
+        self._dirty:list[pg.Rect,] = []
+        self._prev_dirty:list[pg.Rect,] = []
+        self._full_update = True
+        self._last_fill = None
+        self._font_metrics = {}
+        
+        self.update_checker = UpdateChecker(self.meta)
+        if check_updates and not is_offline():
+            self.update_checker.start() # Never blocks, cached on disk
         
     def loadIcon(self):
         self.icon=Icon(self)
@@ -69,10 +152,13 @@ class PyGameEngine:
         Returns:
             tuple[int,int,int]
         """
-        if type(color) in [tuple, list]:
+        t = type(color)
+        if t is reqColor:
+            return color.rgb
+        elif t is tuple or t is list:
             return color
-        elif type(color) == str:
-            return reqColor(hex=color).rgb
+        elif t is str:
+            return reqColor.from_hex(color).rgb
         else:
             try:
                 return color.rgb
@@ -188,21 +274,218 @@ class PyGameEngine:
         """
         Update the screen if there is one, if not try to update the target
         
+        With enableDirtyRects only the parts of the screen drawn in this frame and in the last one are updated.
+        
         Parameters:
             target(Optional):pg.SurfaceType
         Returns:
             None
         """
         if self.hasScreen() and target is None:
-            pg.display.update(self.screen)
+            prof = self.profiler
+            if prof is not None:
+                if prof.graph:
+                    self.markDirty(prof.draw(self.screen))
+                t = time.perf_counter()
+            if self.dirty_mode:
+                self._update_dirty()
+            else:
+                pg.display.update()
+            if prof is not None:
+                now = time.perf_counter()
+                prof.add('display', now - t)
+                t = now
             self.events = self.getEvents()
+            self.input = InputState.from_events(self.events) # Read by all widgets in the next frame
+            self.timers.advance()
+            if prof is not None:
+                prof.add('events', time.perf_counter() - t)
+                prof.end_frame()
         elif target:
             pg.display.update(target)
     
+    # Dirty Rects System
+    def enableDirtyRects(self, state:bool=True, threshold:float=0.5):
+        """
+        Only update the parts of the screen that were drawn(draw_rect, draw_circle, draw_text, widgets)
+        
+        Things blitted directly on the screen must be registered with markDirty.
+        The screen is fully updated when the dirty area is bigger than threshold * screen area.
+        
+        Parameters:
+            state(Optional):bool
+            threshold(Optional):float
+        Returns:
+            None
+        """
+        self.dirty_mode = state
+        self.dirty_threshold = threshold
+        self._dirty = []
+        self._prev_dirty = []
+        self._full_update = True
+    
+    def markDirty(self, rect:pg.Rect=None) -> pg.Rect:
+        """
+        Register a part of the screen to update, None to update the whole screen
+        
+        Parameters:
+            rect(Optional):pg.Rect
+        Returns:
+            pg.Rect - The same rect
+        """
+        if self.dirty_mode:
+            if rect is None:
+                self._full_update = True
+            else:
+                self._dirty.append(pg.Rect(rect))
+        return rect
+    
+    def _touch(self, screen:pg.SurfaceType, rect:pg.Rect):
+        if self.dirty_mode and screen is self.getScreen():
+            self._dirty.append(rect)
+    
+    def _update_dirty(self):
+        # Things drawn in the last frame were erased(fill), so they are updated too
+        rects = self._dirty + self._prev_dirty
+        self._prev_dirty = self._dirty
+        self._dirty = []
+        
+        screen_rect = self.getScreen().get_rect()
+        if self._full_update:
+            self._full_update = False
+            pg.display.update()
+            return
+        
+        rects = merge_rects([screen_rect.clip(r) for r in rects])
+        area = 0
+        for r in rects:
+            area += r.width * r.height
+        if area > self.dirty_threshold * screen_rect.width * screen_rect.height:
+            pg.display.update()
+        elif rects:
+            pg.display.update(rects)
+    
     def fpsw(self):
-        self.clock.tick(self.fps)
+        if self.profiler is not None:
+            t = time.perf_counter()
+            self.clock.tick(self.fps)
+            self.profiler.add('tick', time.perf_counter() - t)
+        else:
+            self.clock.tick(self.fps)
         self._rfps = self.clock.get_fps()
     
+    def enableProfiler(self, state:bool=True, frames:int=300, graph:bool=False) -> FrameProfiler:
+        """
+        Measure the time of each frame phase(events, widgets_update, widgets_draw, user, display, tick)
+        and of each widget type, for the last frames
+        
+        Parameters:
+            state(Optional):bool
+            frames(Optional):int - Frames kept, Defaults to 300
+            graph(Optional):bool - Draw the frame time graph on the screen
+        Returns:
+            FrameProfiler or None - profiler.stats(), profiler.to_json(path), profiler.to_csv(path)
+        """
+        self.profiler = FrameProfiler(frames, graph) if state else None
+        return self.profiler
+    
+    def run(self, update:callable, draw:callable, timestep:float=1/60, max_steps:int=5, events:callable=None, fill_color:reqColor=None, busy_wait:float=0):
+        """
+        Run the game loop until stop() is called or the window is closed.
+        
+        The simulation goes at a fixed timestep whatever the FPS is: update(dt) runs as many times
+        as the time that passed needs(at most max_steps per frame, the rest is dropped so a slow
+        PC doesn't freeze catching up), then draw(alpha) runs once, alpha(0-1) is how far the time
+        is between the last update and the next one, to interpolate positions.
+        The frame rate is limited by setFPS(0 for no limit).
+        
+        Parameters:
+            update:callable - update(dt), dt is always timestep
+            draw:callable - draw(alpha)
+            timestep(Optional):float - Seconds per update, Defaults to 1/60
+            max_steps(Optional):int - Updates per frame at most, Defaults to 5
+            events(Optional):callable - events(list of events), once per frame
+            fill_color(Optional):reqColor - Fill the screen before draw
+            busy_wait(Optional):float - Seconds at the end of each frame waited without sleeping, more precise frame pacing using more CPU
+        Returns:
+            None
+        """
+        self.running = True
+        previous = time.perf_counter()
+        next_frame = previous
+        accumulator = 0.0
+        while self.running:
+            now = time.perf_counter()
+            accumulator += now - previous
+            previous = now
+            
+            if events is not None:
+                events(self.events)
+            for ev in self.events:
+                if ev.type == QUIT:
+                    self.running = False
+            
+            steps = 0
+            while accumulator >= timestep and steps < max_steps:
+                update(timestep)
+                accumulator -= timestep
+                steps += 1
+            if accumulator >= timestep: # Too slow, drop the time that can't be simulated
+                accumulator %= timestep
+            
+            if fill_color is not None:
+                self.fill(fill_color)
+            draw(accumulator / timestep)
+            self.update()
+            
+            # Frame pacing
+            t = time.perf_counter()
+            if self.fps > 0:
+                next_frame += 1 / self.fps
+                remaining = next_frame - time.perf_counter()
+                if remaining < -1 / self.fps: # More than a frame late, don't rush to catch up
+                    next_frame = time.perf_counter()
+                elif remaining > busy_wait:
+                    time.sleep(remaining - busy_wait)
+                while time.perf_counter() < next_frame:
+                    pass
+            self.clock.tick()
+            self._rfps = self.clock.get_fps()
+            if self.profiler is not None:
+                self.profiler.add('tick', time.perf_counter() - t)
+    
+    def stop(self):
+        """
+        Stop run() after the current frame
+        """
+        self.running = False
+    
+    def after(self, seconds:float, callback:callable=None, *args) -> Timer:
+        """
+        Call a function after some seconds(checked in update), without callback it works as a cooldown
+        
+        Parameters:
+            seconds:float
+            callback(Optional):callable
+            *args
+        Returns:
+            Timer - timer.pending while waiting, timer.cancel() to stop it
+        """
+        return self.timers.schedule(seconds, callback, *args)
+    
+    def every(self, seconds:float, callback:callable, *args) -> Timer:
+        """
+        Call a function every some seconds(checked in update), until cancelled
+        
+        Parameters:
+            seconds:float
+            callback:callable
+            *args
+        Returns:
+            Timer
+        """
+        return self.timers.schedule(seconds, callback, *args, interval=seconds)
+    
     def enableFPS_unstable(self, state:bool = True):
         """
         Adds a support for low perfomance PCs
@@ -249,6 +532,9 @@ class PyGameEngine:
                 clr = self.getColor(fill_color)
             else: clr = fill_color
             self.screen.fill(clr)
+            if self.dirty_mode and clr != self._last_fill:
+                self._full_update = True # Background changed, everything must be updated
+            self._last_fill = clr
     
     def flip(self):
         """
@@ -316,6 +602,27 @@ class PyGameEngine:
             font = self.fonts[self._findFont(font)]
         return font
 
+    def getGlyphAtlas(self, font:pg.font.FontType, color:reqColor) -> GlyphAtlas:
+        """
+        Get the glyph atlas of a font in a color, created on first use
+        
+        Parameters:
+            font:pg.font.FontType or int
+            color:reqColor
+        Returns:
+            GlyphAtlas
+        """
+        from .text import FontMetrics, GlyphAtlas
+        font = self._findFont(font)
+        color = tuple(self.getColor(color))
+        atlas = self.glyph_atlases.get((font, color))
+        if atlas is None:
+            metrics = self._font_metrics.get(font)
+            if metrics is None:
+                metrics = self._font_metrics[font] = FontMetrics(font)
+            atlas = self.glyph_atlases[(font, color)] = GlyphAtlas(font, color, metrics)
+        return atlas
+
     # Mouse System
     def getMousePos(self) -> tuple[int,int]:
         """
@@ -342,14 +649,28 @@ class PyGameEngine:
     # Widget System
     def addWidget(self, widget:Widget):
         """
-        Add a widget to the list of widgets
+        Add a widget over the others, its id must be unique
         
         Parameters:
             widget:Widget
         Returns:
             None
         """
-        self.widgets.append(widget)
+        self.widgets.add(widget)
+        if widget.events:
+            self.dispatcher.subscribe(widget, widget.events)
+    
+    def addWidgets(self, widgets:list[Widget,]):
+        """
+        Add a list of widgets, in order
+        
+        Parameters:
+            widgets:list[Widget,]
+        Returns:
+            None
+        """
+        for widget in widgets:
+            self.addWidget(widget)
         
     def create_widget(self, widget_type:str, *args, **kwargs) -> Widget:
         """
@@ -364,7 +685,7 @@ class PyGameEngine:
         """
         # Get the widget
         if type(widget_type) != str:
-            if inspect.isclass(widget_type):
+            if isinstance(widget_type, type):
                 widget = widget_type
             else:
                 raise(CreateWidgetTypeError(str(widget_type)))
@@ -382,31 +703,81 @@ class PyGameEngine:
         Parameters:
             id:str
         Returns:
-            Widget
+            Widget or None
         """
-        for widget in self.widgets:
-            if widget._id == id:
-                return self.widgets[self.widgets.index(widget)]
-        
-        return None
+        return self.widgets.get(id)
 
-    def DeleteWidget(self, id:str):
+    def DeleteWidget(self, id:str) -> Widget:
         """
         Delete a widget from the list of widgets
+        
+        Parameters:
+            id:str
+        Returns:
+            Widget or None - The deleted widget
         """
-        self.widgets.pop(self.findWidgetById(id))
+        widget = self.widgets.remove(id)
+        if widget is not None:
+            self.widget_index.remove(widget)
+            self.dispatcher.unsubscribe(widget)
+        return widget
+
+    def DeleteWidgets(self, ids:list[str,]) -> list[Widget,]:
+        """
+        Delete a list of widgets
+        
+        Parameters:
+            ids:list[str,]
+        Returns:
+            list[Widget,] - The deleted widgets
+        """
+        return [widget for widget in map(self.DeleteWidget, ids) if widget is not None]
+
+    def clearWidgets(self):
+        """
+        Delete all the widgets
+        """
+        self.DeleteWidgets([widget._id for widget in self.widgets])
+
+    def raiseWidget(self, id:str):
+        """
+        Draw a widget over all the others
+        
+        Parameters:
+            id:str
+        Returns:
+            None
+        """
+        self.widgets.raise_to_top(id)
 
     # Image System
-    def loadImage(self, path:str) -> pg.SurfaceType:
+    def loadImage(self, path:str, alpha:bool=None, cached:bool=False) -> pg.SurfaceType:
+        """
+        Load an image from a path, converted to the screen format
+        
+        Parameters:
+            path:str - Or a file-like object(never cached)
+            alpha(Optional):bool - convert_alpha, None chooses from the image
+            cached(Optional):bool - Keep it in the image cache, loading it again only reads the file if it changed
+        Returns:
+            pg.SurfaceType - With cached, shared by the loads of the same path, copy() it before drawing on it
+        """
+        if cached:
+            return self.image_cache.load(path, alpha)
+        return ImageCache.convert(pg.image.load(path), alpha)
+    
+    def releaseImage(self, path:str, alpha:bool=None):
         """
-        Load an image from a path
+        Tell the cache an image of loadImage(cached) is no longer used,
+        it can be dropped when the cache is over cfgcache.IMAGE_CACHE_BYTES
         
         Parameters:
             path:str
+            alpha(Optional):bool - The same of loadImage
         Returns:
-            pg.SurfaceType
+            None
         """
-        return pg.image.load(path)
+        self.image_cache.release(path, alpha)
     
     def createSpritesheet(self, image_path:str) -> spritesheet:
         """
@@ -418,6 +789,59 @@ class PyGameEngine:
             spritesheet
         """
         return spritesheet(self, image_path)
+    
+    def loadAtlas(self, path:str, image_paths:list[str,]=None, page_size:tuple[int,int]=(1024,1024)) -> TextureAtlas:
+        """
+        Load a texture atlas saved in path, if it doesn't exist(or its images changed)
+        pack the images of image_paths and save it there for the next start
+        
+        Parameters:
+            path:str - Layout JSON
+            image_paths(Optional):list[str,] - Images to pack, named by their path
+            page_size(Optional):tuple[int,int]
+        Returns:
+            TextureAtlas - atlas['path.png'] is a region, atlas.blits(screen, [(name, position),]) draws many
+        """
+        from .atlas import TextureAtlas
+        if os.path.exists(path):
+            atlas = TextureAtlas.load(path)
+            if not atlas.is_stale() and all(image in atlas for image in image_paths or ()):
+                return atlas
+        atlas = TextureAtlas(page_size)
+        for image in image_paths or ():
+            atlas.add_file(image)
+        atlas.build()
+        atlas.save(path)
+        return atlas
+    
+    def createAnimation(self, frames:list[pg.SurfaceType,], frame_time:float=0.1, loop:bool=True) -> Animation:
+        """
+        Create an animation that changes frame by time
+        
+        Parameters:
+            frames:list[pg.SurfaceType,] - e.g. spritesheet.load_strip or load_grid
+            frame_time(Optional):float - Seconds per frame
+            loop(Optional):bool
+        Returns:
+            Animation
+        """
+        return Animation(frames, frame_time, loop)
+    
+    def createAssetLoader(self, workers:int=4, progressbar=None) -> AssetLoader:
+        """
+        Create a loader that decodes images, fonts and sounds in threads,
+        call loader.poll() every frame until loader.done
+        
+        Parameters:
+            workers(Optional):int - Threads
+            progressbar(Optional):Progressbar - Its value follows the progress
+        Returns:
+            AssetLoader
+        """
+        from .assets import AssetLoader
+        loader = AssetLoader(self, workers)
+        loader.progressbar = progressbar
+        return loader
 
     # Draw System
     def draw_widgets(self, widgets:list[Widget,]=None):
@@ -429,15 +853,119 @@ class PyGameEngine:
         Returns:
             None
         """
-        if widgets is None or len(widgets) <= 0:
-            widgets = self.widgets
-            
-        for widget in widgets:
-            widget.draw()
+        prof = self.profiler
+        self._dispatch() # Before the snapshot, the events can delete widgets
+
+        live = self.widgets
+        snapshot = live.ordered() # Widgets can be deleted while drawing
+        registry = widgets is None or len(widgets) <= 0
+        if registry:
+            widgets = snapshot
+        else:
+            snapshot = None # A given list can have deleted widgets, always checked
+        awake = self.dispatcher.awake
+        batch = [] # Composed widgets, drawn with one Surface.blits
+        timed = prof is not None
+        clock = time.perf_counter
+        updating = 0.0 # Time in widget.update(), the rest is drawing
+        start = clock()
+        while widgets:
+            for widget in widgets:
+                if live.ordered() is not snapshot and widget not in live: # Deleted, not drawn or indexed again
+                    continue
+                if timed:
+                    t = clock()
+                if widget._batched:
+                    batch.append(widget.render())
+                    if widget._UpdateWhenDraw and (not widget.events or widget in awake):
+                        if timed:
+                            u = clock()
+                            widget.update()
+                            updating += clock() - u
+                        else:
+                            widget.update()
+                else:
+                    if batch: # Keep the drawing order
+                        self._blits(batch)
+                        batch = []
+                    widget.draw() # Indexed by render, an update inside its own draw counts as drawing
+                if timed:
+                    prof.add_widget(widget._type, clock() - t)
+            if not registry or live.ordered() is snapshot:
+                break
+            # Widgets created while drawing(e.g. Select buttons) are drawn in the same frame
+            top = widgets[-1]._order
+            snapshot = live.ordered()
+            widgets = tuple(widget for widget in snapshot if widget._order > top)
+        if batch:
+            self._blits(batch)
+        if timed:
+            prof.add('widgets_update', updating)
+            prof.add('widgets_draw', clock() - start - updating)
+    
+    def _dispatch(self):
+        # Send the events of the frame to the widgets, once per frame even if called more times(draw_widgets, Widget.draw)
+        # Profiled as widgets_update, with the update() calls of draw_widgets
+        if self.dispatcher.input is not self.input:
+            t = time.perf_counter()
+            self.dispatcher.dispatch(self.events, self.input)
+            if self.profiler is not None:
+                self.profiler.add('widgets_update', time.perf_counter() - t)
+    
+    def _blits(self, items:list[tuple,]):
+        # One call for many blits, the rects are only built for the dirty rects
+        if self.dirty_mode:
+            self._dirty.extend(self.screen.blits(items))
+        else:
+            self.screen.blits(items, doreturn=False)
+    
+    def createSpriteBatch(self, background:pg.SurfaceType=None, cell_size:int=64) -> SpriteBatch:
+        """
+        Create a layered group of sprites drawn with one Surface.blits per layer
+        
+        Parameters:
+            background(Optional):pg.SurfaceType - With a background only the changed areas are redrawn
+            cell_size(Optional):int
+        Returns:
+            SpriteBatch
+        """
+        from .sprites import SpriteBatch
+        return SpriteBatch(background, cell_size)
+    
+    def draw_sprites(self, batch:SpriteBatch, screen:pg.SurfaceType=None) -> list[pg.Rect,]:
+        """
+        Draw a SpriteBatch, the changed areas are marked dirty
+        
+        Parameters:
+            batch:SpriteBatch
+            screen(Optional):pg.SurfaceType
+        Returns:
+            list[pg.Rect,] - Changed areas
+        """
+        screen = screen or self.getScreen()
+        rects = batch.draw(screen)
+        if self.dirty_mode and screen is self.getScreen():
+            self._dirty.extend(rects)
+        return rects
+    
+    def getWidgetsAt(self, pos:tuple[int,int]) -> list[Widget,]:
+        """
+        Get the widgets under a position, the last drawn(top) first
+        
+        Parameters:
+            pos:tuple[int,int]
+        Returns:
+            list[Widget,]
+        """
+        return sorted(self.widget_index.query_point(pos), key=lambda widget: widget._order, reverse=True)
+    
     def draw_rect(self, pos:tuple[int,int],size:tuple[int,int], color:reqColor,border_width:int=0,border_color:reqColor=None, screen:pg.SurfaceType=None, alpha:int=255) -> pg.Rect:
         """
         Draw a rect on the screen
         
+        Opaque rects are drawn directly, rects with alpha reuse a filled surface
+        from Engine.rect_cache (keyed by size with border, color and alpha).
+        
         Parameters:
             rect:pg.Rect
             color:reqColor
@@ -457,43 +985,84 @@ class PyGameEngine:
             if border_width > 0 and border_color is not None:
                 b_color = self.getColor(border_color)
                 pg.draw.rect(screen, b_color, rect, border_width)
-            s = pg.Surface((rect.size[0]+border_width, rect.size[1]+border_width), pg.SRCALPHA if (alpha < 255 or alpha != None) else 0)
-            s.fill(color)
-            s.set_alpha(alpha)
             
-            r = s.get_rect()
+            r = pg.Rect(0, 0, rect.size[0]+border_width, rect.size[1]+border_width)
             r.topleft = (rect.left-border_width/2, rect.top-border_width/2)
             
+            self._touch(screen, r)
+            if (alpha is None or alpha >= 255) and (len(color) < 4 or color[3] >= 255):
+                if r.width > 0 and r.height > 0:
+                    pg.draw.rect(screen, color, r) # Opaque, no surface needed
+                return r
+            
+            key = (r.size, tuple(color), alpha)
+            s = self.rect_cache.get(key)
+            if s is None:
+                s = pg.Surface(r.size, pg.SRCALPHA)
+                s.fill(color)
+                s.set_alpha(alpha)
+                self.rect_cache.put(key, s)
+            
             screen.blit(s, r)
             
             return r
 
-    def draw_circle(self, pos:tuple[int,int], radius:int, color:reqColor, screen:pg.SurfaceType=None, alpha:int=255) -> pg.Rect:
+    def draw_circle(self, pos:tuple[int,int], radius:int, color:reqColor, screen:pg.SurfaceType=None, alpha:int=255, width:int=0, antialias:bool=False) -> pg.Rect:
         """
-        Draw a circle on the screen
+        Draw a circle on the screen, pos is the top left corner
+        
+        The circle is rendered once and kept in Engine.shape_cache.
         
         Parameters:
-            rect:pg.Rect
+            pos:tuple[int,int]
+            radius:int
             color:reqColor
             screen(Optional):pg.SurfaceType
             alpha(Optional):int
+            width(Optional):int - Ring thickness, 0 is filled
+            antialias(Optional):bool
         Returns:
             Rect
         """
         if self.hasScreen():
-            rect = pg.Rect(*pos, radius*2, radius*2)
-            
             color = self.getColor(color)
             
             if screen is None:
                 screen = self.getScreen()
-            ss = pg.Surface((radius*2, radius*2), pg.SRCALPHA)
-            ss.set_alpha(alpha)
+            ss = self.shape_cache.circle(radius, tuple(color), alpha, width, antialias)
+            
+            rr = screen.blit(ss, pos)
+            self._touch(screen, rr)
+            
+            return rr
+    
+    def draw_rounded_rect(self, pos:tuple[int,int], size:tuple[int,int], color:reqColor, radius:int, screen:pg.SurfaceType=None, alpha:int=255, width:int=0, antialias:bool=False) -> pg.Rect:
+        """
+        Draw a rect with rounded corners on the screen
+        
+        The rect is rendered once and kept in Engine.shape_cache.
+        
+        Parameters:
+            pos:tuple[int,int]
+            size:tuple[int,int]
+            color:reqColor
+            radius:int - Corners radius
+            screen(Optional):pg.SurfaceType
+            alpha(Optional):int
+            width(Optional):int - Border thickness, 0 is filled
+            antialias(Optional):bool
+        Returns:
+            Rect
+        """
+        if self.hasScreen():
+            color = self.getColor(color)
             
-            rr = pg.draw.ellipse(ss, color, Rect(0, 0, *rect.size))
-            rr.topleft = rect.topleft
+            if screen is None:
+                screen = self.getScreen()
+            ss = self.shape_cache.rounded_rect(size, tuple(color), radius, alpha, width, antialias)
             
-            screen.blit(ss, rr)
+            rr = screen.blit(ss, pos)
+            self._touch(screen, rr)
             
             return rr
 
@@ -501,6 +1070,9 @@ class PyGameEngine:
         """
         Draw text on the screen
         
+        Rendered texts are kept in Engine.text_cache (keyed by font, text, color, background and alpha),
+        so a text that doesn't change is only a blit.
+        
         Parameters:
             text:str
             font:pg.font.FontType
@@ -517,8 +1089,12 @@ class PyGameEngine:
             color = self.getColor(color)
             bgColor = self.getColor(bgColor) if bgColor is not None else None
             
-            render = font.render(text, True, color, None if HasBorder else bgColor)
-            render.set_alpha(alpha)
+            key = (font, text, tuple(color), None if (HasBorder or bgColor is None) else tuple(bgColor), alpha)
+            render = self.text_cache.get(key)
+            if render is None:
+                render = font.render(text, True, color, None if HasBorder else bgColor)
+                render.set_alpha(alpha)
+                self.text_cache.put(key, render)
             
             render_rect = render.get_rect()
             render_rect.topleft = position
@@ -528,8 +1104,35 @@ class PyGameEngine:
                 self.draw_rect(render_rect.topleft, render_rect.size, bgColor, border_width, border_color, screen, alpha)
             
             if screen is None:
-                self.screen.blit(render, render_rect)
-            else:
-                screen.blit(render, render_rect)
+                screen = self.screen
+            screen.blit(render, render_rect)
+            self._touch(screen, render_rect)
             
-            return render_rect
\ No newline at end of file
+            return render_rect
+    
+    def draw_text_fast(self, position:tuple[int,int], text:str, font:pg.font.FontType, color:reqColor, screen:pg.SurfaceType=None, alpha:int=255) -> pg.Rect:
+        """
+        Draw text composed from a glyph atlas, for texts that change every frame (FPS, scores, values)
+        
+        No background or border, for static texts draw_text is faster(cached).
+        
+        Parameters:
+            position:tuple[int,int]
+            text:str
+            font:pg.font.FontType or int
+            color:reqColor
+            screen(Optional):pg.SurfaceType
+            alpha(Optional):int
+        Returns:
+            Rect
+        """
+        if self.hasScreen():
+            if screen is None:
+                screen = self.getScreen()
+            rect = self.getGlyphAtlas(font, color).draw(screen, position, str(text), alpha)
+            self._touch(screen, rect)
+            return rect
+
+# Star imports only give the eager names, listing the lazy ones would import all their modules(numpy for Palette)
+# Lazy names: pygameengine.Button or from pygameengine import Button
+__all__:list[str,] = [name for name in globals() if not name.startswith('_') and name not in ('annotations', 'importlib')]
@@ -0,0 +1,182 @@
+"""
+A File designed to load assets in background for the engine.
+
+- AssetLoader: decodes images, fonts and sounds in threads, converts images on the main thread;
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .required import pg
+
+class AssetLoader:
+    """
+    Loads assets in a thread pool, for loading screens that don't freeze.
+
+    Files are decoded in the threads(pygame releases the GIL while decoding),
+    images are converted to the screen format in poll(), on the main thread,
+    with a time budget per frame.
+
+        loader = engine.createAssetLoader()
+        loader.image('player', 'player.png')
+        loader.font('title', 'font.ttf', 32)
+        loader.start()
+        while not loader.done:
+            loader.poll() # Each frame, also updates loader.progressbar
+            ...
+        player = loader['player']
+    """
+    progressbar:object = None # Progressbar widget updated by poll
+    cancelled:bool = False
+    def __init__(self, engine, workers:int=4):
+        """
+        Parameters:
+            engine:PyGameEngine
+            workers(Optional):int - Threads, Defaults to 4
+        """
+        self.engine = engine
+        self.workers = workers
+        self.assets:dict[str,object] = {}
+        self.errors:dict[str,Exception] = {}
+        self._jobs:list[tuple] = [] # (name, kind, args)
+        self._futures:dict = {} # future: (name, kind, args)
+        self._ready:list = [] # Decoded futures, waiting for the main thread
+        self._executor:ThreadPoolExecutor = None
+        self.total:int = 0
+
+    def __getitem__(self, name:str):
+        return self.assets[name]
+
+    def get(self, name:str, default=None):
+        return self.assets.get(name, default)
+
+    # Queue
+    def image(self, name:str, path:str, alpha:bool=None):
+        """
+        Queue an image, alpha None chooses convert_alpha for images with transparency
+        """
+        self._jobs.append((name, 'image', (path, alpha)))
+
+    def font(self, name:str, path:str, size:int):
+        """
+        Queue a font, path None for the default font
+        """
+        self._jobs.append((name, 'font', (path, size)))
+
+    def sound(self, name:str, path:str):
+        """
+        Queue a sound(needs pg.mixer)
+        """
+        self._jobs.append((name, 'sound', (path,)))
+
+    # Work
+    @staticmethod
+    def _decode(kind:str, args:tuple):
+        # Runs in a thread
+        if kind == 'image':
+            return pg.image.load(args[0])
+        elif kind == 'font':
+            return pg.font.Font(*args)
+        elif kind == 'sound':
+            return pg.mixer.Sound(args[0])
+        raise ValueError(f'Unknown asset kind {kind}')
+
+    def start(self):
+        """
+        Start loading the queued assets
+
+        Returns:
+            None
+        """
+        if not self._jobs:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='AssetLoader')
+        self.cancelled = False
+        for name, kind, args in self._jobs:
+            future = self._executor.submit(self._decode, kind, args)
+            self._futures[future] = (name, kind, args)
+            future.add_done_callback(self._done)
+        self.total += len(self._jobs)
+        self._jobs = []
+
+    def _done(self, future):
+        # Runs in the thread that finished, list.append is atomic
+        self._ready.append(future)
+
+    def _finish(self, future):
+        job = self._futures.pop(future, None)
+        if job is None or future.cancelled(): # Cancelled
+            return
+        name, kind, args = job
+        error = future.exception()
+        if error is not None:
+            self.errors[name] = error
+            return
+        asset = future.result()
+        if kind == 'image':
+            # Converted and shared with engine.loadImage(cached=True)
+            asset = self.engine.image_cache.load(*args, surface=asset)
+        elif kind == 'font' and asset not in self.engine.fonts:
+            self.engine.fonts.append(asset) # Like createFont, widgets find it with _findFont
+        self.assets[name] = asset
+
+    def poll(self, budget:float=0.004) -> float:
+        """
+        Finish the decoded assets, call it every frame(main thread), starts the queued assets
+
+        Parameters:
+            budget(Optional):float - Seconds that can be used in this frame, Defaults to 4ms
+        Returns:
+            float - progress
+        """
+        start = time.perf_counter()
+        if self._jobs:
+            self.start() # Queued but not started yet
+        ready = self._ready
+        while ready and time.perf_counter() - start < budget:
+            self._finish(ready.pop(0))
+        if self.progressbar is not None:
+            self.progressbar.value = self.progress
+        return self.progress
+
+    def wait(self) -> dict:
+        """
+        Block until everything is loaded, starts the queued assets
+
+        Returns:
+            dict - The assets
+        """
+        while not self.done:
+            self.poll(budget=float('inf'))
+            if self._futures and not self._ready:
+                time.sleep(0.001)
+        return self.assets
+
+    @property
+    def progress(self) -> float:
+        """
+        Finished assets(loaded or failed) from 0 to 1
+        """
+        if not self.total:
+            return 1.0
+        return (self.total - len(self._futures)) / self.total
+
+    @property
+    def done(self) -> bool:
+        return not self._futures and not self._jobs
+
+    def cancel(self):
+        """
+        Stop loading, assets already being decoded are dropped
+
+        Returns:
+            None
+        """
+        self.cancelled = True
+        self._jobs = []
+        for future in list(self._futures):
+            future.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._futures.clear()
+        self._ready.clear()
@@ -0,0 +1,288 @@
+"""
+A File designed to pack many small images into a few big surfaces for the engine.
+
+- AtlasRegion: where an image is in the atlas, usable with Surface.blits;
+- TextureAtlas: packs images(skyline algorithm), saves and loads the layout;
+"""
+import json, os
+from .required import pg
+
+class AtlasRegion:
+    """
+    An image inside an atlas page, it doesn't own pixels.
+
+    region.blit_args(position) is (page, position, rect), an item for Surface.blits.
+    """
+    __slots__ = ('name', 'page', 'rect', '_surface')
+    def __init__(self, name:str, page:pg.SurfaceType, rect:pg.Rect):
+        self.name = name
+        self.page = page
+        self.rect = rect
+        self._surface = None
+
+    def __repr__(self) -> str:
+        return f'AtlasRegion({self.name!r}, {tuple(self.rect)})'
+
+    @property
+    def size(self) -> tuple[int,int]:
+        return self.rect.size
+
+    @property
+    def surface(self) -> pg.SurfaceType:
+        """
+        The image as a subsurface of the page(no pixels copied)
+        """
+        if self._surface is None:
+            self._surface = self.page.subsurface(self.rect)
+        return self._surface
+
+    def blit_args(self, position:tuple[int,int]) -> tuple:
+        return (self.page, position, self.rect)
+
+class _Skyline:
+    # Bottom-left skyline packer: the top of the used area is kept as segments [x, y, width]
+    def __init__(self, width:int, height:int):
+        self.width = width
+        self.height = height
+        self.nodes:list[list[int]] = [[0, 0, width]]
+
+    def _fit(self, i:int, w:int, h:int) -> int:
+        x = self.nodes[i][0]
+        if x + w > self.width:
+            return None
+        y = 0
+        remaining = w
+        while remaining > 0:
+            y = max(y, self.nodes[i][1])
+            if y + h > self.height:
+                return None
+            remaining -= self.nodes[i][2]
+            i += 1
+        return y
+
+    def insert(self, w:int, h:int) -> tuple[int,int]:
+        best = None
+        for i, (x, _, _) in enumerate(self.nodes):
+            y = self._fit(i, w, h)
+            if y is not None and (best is None or y < best[1]):
+                best = (x, y, i)
+        if best is None:
+            return None
+        x, y, i = best
+        nodes = self.nodes
+        nodes.insert(i, [x, y + h, w])
+        # Segments under the new one are cut
+        j = i + 1
+        while j < len(nodes):
+            right = nodes[j - 1][0] + nodes[j - 1][2]
+            if nodes[j][0] >= right:
+                break
+            cut = right - nodes[j][0]
+            nodes[j][0] += cut
+            nodes[j][2] -= cut
+            if nodes[j][2] > 0:
+                break
+            del nodes[j]
+        # Merge segments at the same height
+        j = 0
+        while j < len(nodes) - 1:
+            if nodes[j][1] == nodes[j + 1][1]:
+                nodes[j][2] += nodes.pop(j + 1)[2]
+            else:
+                j += 1
+        return (x, y)
+
+class TextureAtlas:
+    """
+    Packs images into pages(big surfaces) with a skyline packer.
+
+    Drawing many regions of the same page with one Surface.blits is much cheaper than
+    one blit per small surface, and the small surfaces can be freed.
+    The layout and the pages can be saved, the next start only loads them.
+    """
+    page_size:tuple[int,int] = (1024, 1024)
+    padding:int = 1 # Pixels between images, avoids bleeding when scaled
+    def __init__(self, page_size:tuple[int,int]=None, padding:int=None):
+        """
+        Parameters:
+            page_size(Optional):tuple[int,int] - Defaults to (1024, 1024), bigger images get their own page
+            padding(Optional):int - Defaults to 1
+        """
+        if page_size is not None:
+            self.page_size = tuple(page_size)
+        if padding is not None:
+            self.padding = padding
+        self.pages:list[pg.SurfaceType] = []
+        self.regions:dict[str,AtlasRegion] = {}
+        self.sources:dict[str,list] = {} # name: [path, mtime], for files
+        self._pending:dict[str,pg.SurfaceType] = {}
+
+    def __len__(self) -> int:
+        return len(self.regions)
+
+    def __contains__(self, name:str) -> bool:
+        return name in self.regions
+
+    def __getitem__(self, name:str) -> AtlasRegion:
+        return self.regions[name]
+
+    def get(self, name:str) -> AtlasRegion:
+        return self.regions.get(name)
+
+    def add(self, name:str, surface:pg.SurfaceType):
+        """
+        Add an image, packed in the next build()
+
+        Parameters:
+            name:str
+            surface:pg.SurfaceType
+        Returns:
+            None
+        """
+        self._pending[name] = surface
+
+    def add_file(self, path:str, name:str=None):
+        """
+        Add an image file, the name defaults to the path
+
+        Parameters:
+            path:str
+            name(Optional):str
+        Returns:
+            None
+        """
+        name = path if name is None else name
+        self.add(name, pg.image.load(path))
+        self.sources[name] = [os.path.abspath(path), os.path.getmtime(path)]
+
+    def add_spritesheet(self, sheet, size:tuple[int,int], prefix:str=None, **kwargs):
+        """
+        Add all the sprites of a spritesheet grid, named prefix + index
+
+        Parameters:
+            sheet:spritesheet
+            size:tuple[int,int]
+            prefix(Optional):str - Defaults to the sheet path
+            **kwargs - load_grid options(count, margin, spacing)
+        Returns:
+            None
+        """
+        prefix = sheet.image_path if prefix is None else prefix
+        for i, sprite in enumerate(sheet.load_grid(size, **kwargs)):
+            self.add(f'{prefix}{i}', sprite)
+
+    def build(self) -> list[pg.SurfaceType,]:
+        """
+        Pack the added images into pages, already packed ones are kept
+
+        Returns:
+            list[pg.SurfaceType,] - The pages
+        """
+        pad = self.padding
+        # Tallest first packs better
+        items = sorted(self._pending.items(), key=lambda item: (item[1].get_height(), item[1].get_width()), reverse=True)
+        self._pending = {}
+        packers = []
+        start = len(self.pages)
+        for name, surface in items:
+            w, h = surface.get_size()
+            position = None
+            for page, packer in packers:
+                position = packer.insert(w + pad, h + pad)
+                if position is not None:
+                    break
+            if position is None:
+                size = (max(self.page_size[0], w + pad), max(self.page_size[1], h + pad))
+                page = pg.Surface(size, pg.SRCALPHA)
+                packer = _Skyline(*size)
+                packers.append((page, packer))
+                self.pages.append(page)
+                position = packer.insert(w + pad, h + pad)
+            page.blit(surface, position)
+            self.regions[name] = AtlasRegion(name, page, pg.Rect(position, (w, h)))
+        if pg.display.get_surface() is not None:
+            self._convert(start)
+        return self.pages
+
+    def _convert(self, start:int=0):
+        # Pixel format of the screen, faster blits
+        for i in range(start, len(self.pages)):
+            old = self.pages[i]
+            page = self.pages[i] = old.convert_alpha()
+            for region in self.regions.values():
+                if region.page is old:
+                    region.page = page
+                    region._surface = None
+
+    def blits(self, target:pg.SurfaceType, items:list[tuple[str,tuple[int,int]],]) -> list[pg.Rect,]:
+        """
+        Draw many regions with one Surface.blits
+
+        Parameters:
+            target:pg.SurfaceType
+            items:list[tuple[str,tuple[int,int]],] - (name, position)
+        Returns:
+            list[pg.Rect,]
+        """
+        regions = self.regions
+        return target.blits([regions[name].blit_args(position) for name, position in items])
+
+    # Save/Load
+    def save(self, path:str):
+        """
+        Save the layout as JSON and the pages as png next to it(path without .json + _0.png, _1.png...)
+
+        Parameters:
+            path:str
+        Returns:
+            None
+        """
+        base = os.path.splitext(path)[0]
+        pages = []
+        for i, page in enumerate(self.pages):
+            file = f'{base}_{i}.png'
+            pg.image.save(page, file)
+            pages.append(os.path.basename(file))
+        index = {id(page): i for i, page in enumerate(self.pages)}
+        layout = {
+            'page_size': list(self.page_size),
+            'padding': self.padding,
+            'pages': pages,
+            'regions': {name: [index[id(region.page)], *region.rect] for name, region in self.regions.items()},
+            'sources': self.sources,
+        }
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(layout, f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path:str) -> 'TextureAtlas':
+        """
+        Load an atlas saved with save()
+
+        Parameters:
+            path:str
+        Returns:
+            TextureAtlas
+        """
+        with open(path) as f:
+            layout = json.load(f)
+        atlas = cls(layout['page_size'], layout['padding'])
+        folder = os.path.dirname(path)
+        atlas.pages = [pg.image.load(os.path.join(folder, file)) for file in layout['pages']]
+        atlas.sources = layout.get('sources', {})
+        for name, (page, x, y, w, h) in layout['regions'].items():
+            atlas.regions[name] = AtlasRegion(name, atlas.pages[page], pg.Rect(x, y, w, h))
+        if pg.display.get_surface() is not None:
+            atlas._convert()
+        return atlas
+
+    def is_stale(self) -> bool:
+        """
+        If an image file added with add_file changed or was removed since it was packed
+        """
+        for path, mtime in self.sources.values():
+            if not os.path.exists(path) or os.path.getmtime(path) != mtime:
+                return True
+        return False
@@ -0,0 +1,270 @@
+"""
+A File designed to keep pre-rendered surfaces for the engine.
+
+- SurfaceCache: LRU cache of surfaces with a memory budget;
+- ImageCache: loaded images by path, converted to the screen format, with references;
+"""
+import os
+from collections import OrderedDict
+from .required import pg
+
+def surface_bytes(surface:pg.SurfaceType) -> int:
+    """
+    Memory used by the pixels of a surface
+
+    Parameters:
+        surface:pg.SurfaceType
+    Returns:
+        int
+    """
+    return surface.get_height() * surface.get_pitch()
+
+class SurfaceCache:
+    """
+    LRU cache of surfaces.
+
+    The least recently used surfaces are dropped when the memory
+    used by the pixels goes over max_bytes.
+    """
+    bytes:int = 0
+    hits:int = 0
+    misses:int = 0
+    def __init__(self, max_bytes:int):
+        """
+        Parameters:
+            max_bytes:int - Memory budget, 0 disables the cache
+        """
+        self._items:OrderedDict = OrderedDict()
+        self._max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes:int):
+        self._max_bytes = max_bytes
+        self._evict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key) -> bool:
+        return key in self._items
+
+    def get(self, key) -> pg.SurfaceType:
+        """
+        Get a surface and mark it as recently used
+
+        Parameters:
+            key:any hashable
+        Returns:
+            pg.SurfaceType or None
+        """
+        surface = self._items.get(key)
+        if surface is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return surface
+
+    def put(self, key, surface:pg.SurfaceType) -> pg.SurfaceType:
+        """
+        Add a surface, surfaces bigger than the whole budget are not kept
+
+        Parameters:
+            key:any hashable
+            surface:pg.SurfaceType
+        Returns:
+            pg.SurfaceType - The same surface
+        """
+        size = surface_bytes(surface)
+        if size > self._max_bytes:
+            return surface
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.bytes -= surface_bytes(old)
+        self._items[key] = surface
+        self.bytes += size
+        self._evict()
+        return surface
+
+    def _evict(self):
+        while self.bytes > self._max_bytes and self._items:
+            _, surface = self._items.popitem(last=False)
+            self.bytes -= surface_bytes(surface)
+
+    def clear(self):
+        self._items.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Get the cache statistics
+
+        Parameters:
+            None
+        Returns:
+            dict - items, bytes, max_bytes, hits, misses, hit_rate
+        """
+        total = self.hits + self.misses
+        return {
+            'items': len(self._items),
+            'bytes': self.bytes,
+            'max_bytes': self._max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0,
+        }
+
+class ImageCache:
+    """
+    Images loaded from files, by path and modification time.
+
+    Images are converted to the pixel format of the screen(convert_alpha when
+    the image has transparency), blits of them don't convert every pixel.
+    Each load counts a reference, release() drops it; when the memory goes over
+    max_bytes the least recently used images without references are dropped.
+    The surfaces are shared, copy() one before drawing on it.
+    """
+    bytes:int = 0
+    hits:int = 0
+    misses:int = 0
+    def __init__(self, max_bytes:int):
+        """
+        Parameters:
+            max_bytes:int - Memory budget for images without references
+        """
+        self._items:OrderedDict = OrderedDict() # (path, alpha): [surface, mtime, refs, converted]
+        self._max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes:int):
+        self._max_bytes = max_bytes
+        self._evict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, path:str) -> bool:
+        path = os.path.abspath(path)
+        return any(key[0] == path for key in self._items)
+
+    @staticmethod
+    def convert(surface:pg.SurfaceType, alpha:bool=None) -> pg.SurfaceType:
+        """
+        Convert to the pixel format of the screen, the image is returned as is without a screen
+
+        Parameters:
+            surface:pg.SurfaceType
+            alpha(Optional):bool - None chooses from the image(per pixel alpha or colorkey)
+        Returns:
+            pg.SurfaceType
+        """
+        if pg.display.get_surface() is None:
+            return surface
+        if alpha is None:
+            alpha = bool(surface.get_flags() & pg.SRCALPHA) or surface.get_colorkey() is not None
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    def load(self, path:str, alpha:bool=None, surface:pg.SurfaceType=None) -> pg.SurfaceType:
+        """
+        Get an image, loaded again only if the file changed, and add a reference
+
+        Parameters:
+            path:str - A file-like object is loaded and converted but not cached
+            alpha(Optional):bool - None chooses from the image
+            surface(Optional):pg.SurfaceType - Already decoded image of path(e.g. by a thread), used if not cached
+        Returns:
+            pg.SurfaceType
+        """
+        if not isinstance(path, (str, os.PathLike)):
+            return self.convert(pg.image.load(path) if surface is None else surface, alpha)
+        key = (os.path.abspath(path), alpha)
+        mtime = os.path.getmtime(path)
+        item = self._items.get(key)
+        if item is not None and item[1] == mtime:
+            self._items.move_to_end(key)
+            self.hits += 1
+            if not item[3] and pg.display.get_surface() is not None:
+                # Loaded before the screen existed
+                self.bytes -= surface_bytes(item[0])
+                item[0] = self.convert(item[0], alpha)
+                item[3] = True
+                self.bytes += surface_bytes(item[0])
+            item[2] += 1
+            return item[0]
+        self.misses += 1
+        if surface is None:
+            surface = pg.image.load(path)
+        converted = pg.display.get_surface() is not None
+        surface = self.convert(surface, alpha)
+        refs = 1
+        if item is not None: # File changed, the old references move to the new image
+            self.bytes -= surface_bytes(item[0])
+            refs += item[2]
+        self._items[key] = [surface, mtime, refs, converted]
+        self._items.move_to_end(key)
+        self.bytes += surface_bytes(surface)
+        self._evict()
+        return surface
+
+    def release(self, path:str, alpha:bool=None):
+        """
+        Drop a reference, the image can be dropped when the memory is over max_bytes
+
+        Parameters:
+            path:str
+            alpha(Optional):bool - The same of load
+        Returns:
+            None
+        """
+        if not isinstance(path, (str, os.PathLike)):
+            return
+        item = self._items.get((os.path.abspath(path), alpha))
+        if item is not None and item[2] > 0:
+            item[2] -= 1
+            self._evict()
+
+    def _evict(self):
+        if self.bytes <= self._max_bytes:
+            return
+        for key in [key for key, item in self._items.items() if item[2] <= 0]:
+            self.bytes -= surface_bytes(self._items.pop(key)[0])
+            if self.bytes <= self._max_bytes:
+                break
+
+    def clear(self):
+        self._items.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Get the cache statistics
+
+        Parameters:
+            None
+        Returns:
+            dict - items, bytes, max_bytes, referenced, hits, misses, hit_rate
+        """
+        total = self.hits + self.misses
+        return {
+            'items': len(self._items),
+            'bytes': self.bytes,
+            'max_bytes': self._max_bytes,
+            'referenced': sum(1 for item in self._items.values() if item[2] > 0),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0,
+        }
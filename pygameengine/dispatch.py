@@ -0,0 +1,151 @@
+"""
+A File designed to send the input events to the widgets of an engine.
+
+- EventDispatcher: routes events to the widgets that subscribed to them;
+"""
+from .required import pg
+
+POINTER_EVENTS = (pg.MOUSEBUTTONDOWN, pg.MOUSEBUTTONUP, pg.MOUSEMOTION, pg.MOUSEWHEEL) # Sent to the widget under the mouse
+FOCUS_EVENTS = (pg.KEYDOWN, pg.KEYUP, pg.TEXTINPUT) # Sent to the focused widget
+
+class EventDispatcher:
+    """
+    Sends each event only to the widgets that asked for it.
+
+    - Mouse events go to the top subscribed widget under the mouse,
+      or to the widget that captured the mouse(pressed on it, until released);
+    - Keyboard events go to the focused widget(focusable widgets get the focus when clicked);
+    - Widgets that need to update every frame(cooldowns, keys held) stay awake until they sleep.
+
+    Widgets without events aren't touched, so the work grows with the events, not with the widgets.
+    """
+    focus:object = None # Gets the keyboard events
+    hover:object = None # Top widget under the mouse
+    capture:object = None # Gets the mouse events until the button is released
+    input:object = None # InputState already dispatched
+    def __init__(self, engine):
+        """
+        Parameters:
+            engine:PyGameEngine
+        """
+        self.engine = engine
+        self.subscribers:dict[int,set] = {}
+        self.awake:set = set()
+
+    def subscribe(self, widget, types:tuple[int,]):
+        """
+        Send events of these types to widget.handle_event
+
+        Parameters:
+            widget:Widget
+            types:tuple[int,]
+        Returns:
+            None
+        """
+        for t in types:
+            bucket = self.subscribers.get(t)
+            if bucket is None:
+                bucket = self.subscribers[t] = set()
+            bucket.add(widget)
+
+    def unsubscribe(self, widget, types:tuple[int,]=None):
+        """
+        Stop sending events to a widget, all the types when None(also drops focus, capture and hover)
+
+        Parameters:
+            widget:Widget
+            types(Optional):tuple[int,]
+        Returns:
+            None
+        """
+        for t in (tuple(self.subscribers) if types is None else types):
+            bucket = self.subscribers.get(t)
+            if bucket is not None:
+                bucket.discard(widget)
+        if types is None:
+            self.awake.discard(widget)
+            if self.focus is widget:
+                self.focus = None
+            if self.capture is widget:
+                self.capture = None
+            if self.hover is widget:
+                self.hover = None
+
+    def wake(self, widget):
+        self.awake.add(widget)
+
+    def sleep(self, widget):
+        self.awake.discard(widget)
+
+    def set_focus(self, widget):
+        """
+        Give the keyboard to a widget, None to remove the focus
+
+        Parameters:
+            widget:Widget or None
+        Returns:
+            None
+        """
+        if widget is self.focus:
+            return
+        old, self.focus = self.focus, widget
+        if old is not None:
+            old.on_blur()
+        if widget is not None:
+            widget.on_focus()
+
+    def widget_at(self, pos:tuple[int,int], type:int=None):
+        """
+        Get the top widget under a position, only the ones subscribed to type if given
+
+        Parameters:
+            pos:tuple[int,int]
+            type(Optional):int
+        Returns:
+            Widget or None
+        """
+        found = self.engine.widget_index.query_point(pos)
+        if type is not None:
+            found &= self.subscribers.get(type, set())
+        return max(found, key=lambda widget: widget._order) if found else None
+
+    def send(self, widget, event:pg.event.Event):
+        if widget is not None and widget in self.subscribers.get(event.type, ()):
+            widget.handle_event(event)
+
+    def dispatch(self, events:list[pg.event.Event,], input):
+        """
+        Route the events of a frame
+
+        Parameters:
+            events:list[pg.event.Event,]
+            input:InputState
+        Returns:
+            None
+        """
+        self.input = input
+        if self.subscribers:
+            for event in events:
+                t = event.type
+                if t in FOCUS_EVENTS:
+                    self.send(self.focus, event)
+                elif t == pg.MOUSEBUTTONDOWN:
+                    target = self.widget_at(event.pos, t)
+                    if event.button == 1:
+                        self.set_focus(target if target is not None and target.focusable else None)
+                    if target is not None:
+                        self.capture = target
+                        target.handle_event(event)
+                elif t == pg.MOUSEBUTTONUP:
+                    self.send(self.capture if self.capture is not None else self.widget_at(event.pos, t), event)
+                    self.capture = None
+                elif t == pg.MOUSEMOTION:
+                    self.send(self.capture if self.capture is not None else self.widget_at(event.pos, t), event)
+                elif t == pg.MOUSEWHEEL:
+                    self.send(self.widget_at(input.mouse_pos, t), event)
+        self.hover = self.widget_at(input.mouse_pos)
+
+    def clear(self):
+        self.subscribers.clear()
+        self.awake.clear()
+        self.focus = self.capture = self.hover = None
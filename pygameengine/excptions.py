@@ -1,4 +1,8 @@
 # Widgets Errors
 class CreateWidgetTypeError(Exception):
     def __init__(self, widget_type:str):
-        super().__init__(f'The widget type {widget_type} is not a valid widget type or cant can be found.')
\ No newline at end of file
+        super().__init__(f'The widget type {widget_type} is not a valid widget type or cant can be found.')
+
+class WidgetIdError(Exception):
+    def __init__(self, id:str):
+        super().__init__(f'There is already a widget with the id {id}, ids must be unique.')
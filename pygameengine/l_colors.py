@@ -1,41 +1,118 @@
-from .widgets import *
 from .objects import color as reqColor
-import requests, json
+from .network import read_cache, write_cache, fetch_json, is_offline
+import json, os, threading
 import random
 
 Git_Colors_JS = 'https://mrjuaumbr.github.io/data/colors.json'
+Bundled_Colors_JS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'colors.json') # Snapshot shipped with the package
+Cache_Colors_JS = 'colors.json' # Inside cfgnetwork.CACHE_DIR, written by Colors.refresh
 
 # Colors
 class Colors:
-    aliases:list[str,] = []
-    def __init__(self):
+    aliases:list[str,]
+    _loaded:bool = False
+    def __init__(self, refresh:bool=False):
         """
         Some named colors from:
         https://encycolorpedia.com/named
+        
+        Only the built-in colors are created here, the palette is loaded
+        on the first color that is not found (or with Colors.load).
+        
+        Parameters:
+            refresh(Optional):bool - Download the online palette in background for the next starts
         """
+        self.aliases = []
         self.colors_add()
-        self.add_colors_from_json()
-        print(f'\t - [!] Built in: {self.number_of_colors()} colors')
+        self.add_aliases()
+        if refresh:
+            self.refresh()
+    
+    def __getattr__(self, name:str) -> reqColor:
+        # Only called when the attribute is missing
+        if name.startswith('__') or self._loaded:
+            raise AttributeError(f"'{type(self).__name__}' has no color '{name}'")
+        self.load()
+        return getattr(self, name)
     
     def get(self, color_name:str) -> reqColor:
         return getattr(self, color_name)
     
-    def add_colors_from_json(self):
-        colors = requests.get(Git_Colors_JS).json()
+    def load(self) -> int:
+        """
+        Load the palette, from the local cache if there is one, if not from the bundled snapshot.
+        Built-in colors are never replaced.
+        
+        Parameters:
+            None
+        Returns:
+            int - Number of colors added
+        """
+        if self._loaded:
+            return 0
+        self._loaded = True
+        colors = read_cache(Cache_Colors_JS)
+        if type(colors) != dict:
+            with open(Bundled_Colors_JS, 'r', encoding='utf-8') as f:
+                colors = json.load(f)
+        return self.add_colors(colors)
+    
+    def add_colors(self, colors:dict) -> int:
+        """
+        Add colors from a dict of name: [r,g,b]
+        
+        Parameters:
+            colors:dict
+        Returns:
+            int - Number of colors added
+        """
+        x = 0
         for color in colors.keys():
-            setattr(self, color.upper(), reqColor(*colors[color])) # Default
-            
+            if color.upper() not in self.__dict__:
+                setattr(self, color.upper(), reqColor(*colors[color])) # Default
+                x += 1
         self.add_aliases()
+        return x
+    
+    def add_colors_from_json(self):
+        """
+        Download the online palette now and add it (Blocking, prefer Colors.refresh)
+        """
+        colors = fetch_json(Git_Colors_JS)
+        write_cache(Cache_Colors_JS, colors)
+        self.add_colors(colors)
+    
+    def refresh(self) -> threading.Thread:
+        """
+        Download the online palette to the local cache in a daemon thread, used by the next Colors.load
+        
+        Parameters:
+            None
+        Returns:
+            threading.Thread or None if offline
+        """
+        if is_offline():
+            return None
+        def run():
+            try:
+                colors = fetch_json(Git_Colors_JS)
+            except Exception: return
+            if type(colors) == dict:
+                write_cache(Cache_Colors_JS, colors)
+        thread = threading.Thread(target=run, name='maxpygame-colors-refresh', daemon=True)
+        thread.start()
+        return thread
             
     def add_aliases(self):
         colors = self.__dict__.copy()
+        aliases = set(self.aliases)
         for color in colors.keys():
-            if type(self.__dict__[color]) == reqColor:
-                setattr(self, color.capitalize(), self.__dict__[color])
-                setattr(self, color.lower(), self.__dict__[color])
-                
-                self.aliases.append(color.capitalize())
-                self.aliases.append(color.lower())
+            if type(colors[color]) == reqColor and color not in aliases:
+                for alias in (color.capitalize(), color.lower()):
+                    if alias not in self.__dict__:
+                        setattr(self, alias, colors[color])
+                        self.aliases.append(alias)
+                        aliases.add(alias)
     
     def colors_add(self):
         # Basic Colors
@@ -113,13 +190,31 @@ class Colors:
         
     
     def random(self) -> reqColor:
-        x = random.choice(self.__dict__.keys())
+        self.load()
+        aliases = set(self.aliases)
+        x = random.choice([color for color in self.__dict__.keys() if color not in aliases and type(self.__dict__[color]) == reqColor])
         x = self.__dict__[x]
         return x
 
     def number_of_colors(self) -> int:
+        self.load()
+        aliases = set(self.aliases)
         x = 0
         for color in self.__dict__.keys():
-            if color not in self.aliases and type(self.__dict__[color]) == reqColor:
+            if color not in aliases and type(self.__dict__[color]) == reqColor:
                 x += 1
-        return x
\ No newline at end of file
+        return x
+
+    def palette(self):
+        """
+        All the colors(without aliases) in a numpy Palette, for operations on many colors at once.
+        Needs numpy, scipy makes Palette.nearest faster.
+        
+        Parameters:
+            None
+        Returns:
+            Palette
+        """
+        from .palette import Palette
+        self.load()
+        return Palette.from_colors(self)
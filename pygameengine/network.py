@@ -0,0 +1,174 @@
+"""
+A File designed to work with the online side of the engine.
+
+- Disk cache;
+- Json fetching;
+- Version check;
+"""
+import json, os, threading, time
+from .objects import cfgnetwork
+
+# Disk Cache
+def cache_path(filename:str) -> str:
+    """
+    Get the path of a file inside the engine cache folder
+
+    Parameters:
+        filename:str
+    Returns:
+        str
+    """
+    return os.path.join(cfgnetwork.CACHE_DIR, filename)
+
+def read_cache(filename:str, ttl:float=None) -> dict:
+    """
+    Read a json file from the cache folder
+
+    Parameters:
+        filename:str
+        ttl(Optional):float - Max age in seconds, None for no limit
+    Returns:
+        dict or None if it doesn't exist, is too old or is invalid
+    """
+    path = cache_path(filename)
+    try:
+        if ttl is not None and (time.time() - os.path.getmtime(path)) > ttl:
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def write_cache(filename:str, data:dict) -> bool:
+    """
+    Write a json file to the cache folder
+
+    Parameters:
+        filename:str
+        data:dict
+    Returns:
+        bool - If it was written
+    """
+    path = cache_path(filename)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, path) # Atomic, readers never see a half written file
+        return True
+    except OSError:
+        return False
+
+def is_offline() -> bool:
+    """
+    Check if the online features are disabled by the environment (MAXPYGAME_OFFLINE=1)
+
+    Parameters:
+        None
+    Returns:
+        bool
+    """
+    return os.environ.get(cfgnetwork.OFFLINE_ENV, '').lower() in ('1', 'true', 'yes')
+
+def fetch_json(url:str, timeout:float=None) -> dict:
+    """
+    Download a json, requests is only imported here so it never costs startup time
+
+    Parameters:
+        url:str
+        timeout(Optional):float
+    Returns:
+        dict
+    """
+    import requests
+    response = requests.get(url, timeout=cfgnetwork.TIMEOUT if timeout is None else timeout)
+    response.raise_for_status()
+    return response.json()
+
+# Version Check
+class UpdateChecker:
+    """
+    Checks the engine version in a background thread.
+
+    The online result is cached on disk for cfgnetwork.VERSION_CACHE_TTL seconds,
+    so most starts only read a small local file.
+    """
+    cache_file:str = 'version.json'
+    meta:object
+    thread:threading.Thread = None
+    online_version:int = None
+    status:str = None # 'new', 'unknown', 'updated' or None while unknown
+
+    def __init__(self, meta):
+        self.meta = meta
+
+    def start(self) -> threading.Thread:
+        """
+        Start the check, uses the cache when it is fresh, if not download it in a daemon thread
+
+        Parameters:
+            None
+        Returns:
+            threading.Thread or None if the cache was used
+        """
+        data = read_cache(self.cache_file, cfgnetwork.VERSION_CACHE_TTL)
+        if data is not None:
+            self.report(data)
+            return None
+        self.thread = threading.Thread(target=self._run, name='maxpygame-update-check', daemon=True)
+        self.thread.start()
+        return self.thread
+
+    def wait(self, timeout:float=None) -> str:
+        """
+        Wait for the background check to finish
+
+        Parameters:
+            timeout(Optional):float
+        Returns:
+            str - The status
+        """
+        if self.thread is not None:
+            self.thread.join(timeout)
+        return self.status
+
+    def _run(self):
+        try:
+            data = fetch_json(cfgnetwork.VERSION_URL)
+        except Exception: return # Offline, timeout or bad answer, try again in the next start
+        write_cache(self.cache_file, data)
+        self.report(data)
+
+    def local_version(self) -> int:
+        """
+        Convert the metadata version to the same int used online (0.1.7 -> 17, 0.1.6fix -> 16)
+
+        Parameters:
+            None
+        Returns:
+            int or None if it can't be converted
+        """
+        try:
+            return self.meta.splitver2int()
+        except ValueError: # Cant convert to int
+            if 'fix' in self.meta.version:
+                return int(self.meta.splitver().replace('fix',''))
+        return None
+
+    def report(self, data:dict):
+        if type(data) != dict or 'version' not in data.keys():
+            return
+        ver = self.local_version()
+        if ver is None:
+            return
+        self.online_version = data['version']
+        if self.online_version > ver:
+            self.status = 'new'
+            print(f'\t - [!] New version available, please go to: {self.meta.github}')
+        elif self.online_version < ver:
+            self.status = 'unknown'
+            print(f'\t - [!] You are using an unknown version, please go to: {self.meta.github}')
+        else:
+            self.status = 'updated'
+            print(f'\t - Updated version.')
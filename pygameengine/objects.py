@@ -84,6 +84,87 @@ class TTimeSys:
             return int((x*self.fps)*seconds)
         else: return int(seconds*self.fps)
 
+# Input
+class InputState:
+    """
+    Input of a frame, built once in PyGameEngine.update from the events.
+    
+    Widgets read it instead of asking SDL, so the input cost doesn't grow with the number of widgets.
+    It can't be changed after created.
+    """
+    __slots__ = ('mouse_pos', 'mouse_pressed', 'keys', 'mouse_down', 'mouse_up', 'keys_down', 'keys_up', 'typed', 'text', 'wheel')
+    mouse_pos:tuple[int,int]
+    mouse_pressed:tuple[bool,bool,bool]
+    keys:pg.key.ScancodeWrapper
+    mouse_down:frozenset # Buttons pressed in this frame
+    mouse_up:frozenset # Buttons released in this frame
+    keys_down:frozenset # Keys pressed in this frame
+    keys_up:frozenset # Keys released in this frame
+    typed:tuple[tuple[int,str],] # (key, unicode) of each KEYDOWN in order
+    text:str # TEXTINPUT of this frame
+    wheel:tuple[int,int]
+    def __init__(self, mouse_pos:tuple[int,int], mouse_pressed:tuple[bool,bool,bool], keys:pg.key.ScancodeWrapper,
+                 mouse_down:frozenset=frozenset(), mouse_up:frozenset=frozenset(), keys_down:frozenset=frozenset(), keys_up:frozenset=frozenset(),
+                 typed:tuple=(), text:str='', wheel:tuple[int,int]=(0,0)):
+        for name, value in (('mouse_pos', tuple(mouse_pos)), ('mouse_pressed', tuple(mouse_pressed)), ('keys', keys),
+                            ('mouse_down', mouse_down), ('mouse_up', mouse_up), ('keys_down', keys_down), ('keys_up', keys_up),
+                            ('typed', typed), ('text', text), ('wheel', wheel)):
+            object.__setattr__(self, name, value)
+    
+    def __setattr__(self, name:str, value:any):
+        raise AttributeError('InputState is immutable')
+    
+    @classmethod
+    def from_events(cls, events:list[pg.event.Event,]) -> 'InputState':
+        """
+        Create the state of a frame, SDL is asked only once for mouse and keys
+        
+        Parameters:
+            events:list[pg.event.Event,]
+        Returns:
+            InputState
+        """
+        mouse_down, mouse_up, keys_down, keys_up = set(), set(), set(), set()
+        typed = []
+        text = ''
+        wx, wy = 0, 0
+        for ev in events:
+            if ev.type == MOUSEBUTTONDOWN:
+                mouse_down.add(ev.button)
+            elif ev.type == MOUSEBUTTONUP:
+                mouse_up.add(ev.button)
+            elif ev.type == KEYDOWN:
+                keys_down.add(ev.key)
+                typed.append((ev.key, ev.unicode))
+            elif ev.type == KEYUP:
+                keys_up.add(ev.key)
+            elif ev.type == TEXTINPUT:
+                text += ev.text
+            elif ev.type == MOUSEWHEEL:
+                wx += ev.x
+                wy += ev.y
+        return cls(pg.mouse.get_pos(), pg.mouse.get_pressed(3), pg.key.get_pressed(),
+                   frozenset(mouse_down), frozenset(mouse_up), frozenset(keys_down), frozenset(keys_up),
+                   tuple(typed), text, (wx, wy))
+    
+    def clicked(self, button:int=1) -> bool:
+        """
+        If the mouse button was pressed in this frame(1 left, 2 middle, 3 right)
+        """
+        return button in self.mouse_down
+    
+    def released(self, button:int=1) -> bool:
+        """
+        If the mouse button was released in this frame(1 left, 2 middle, 3 right)
+        """
+        return button in self.mouse_up
+    
+    def pressed(self, key:int) -> bool:
+        """
+        If the key is held down
+        """
+        return bool(self.keys[key])
+
 class cfgtimes:
     """
     settings the delay time for the engine
@@ -97,6 +178,48 @@ class cfgtimes:
     WD_TXBX_KEYP_TIME = 0.075 # Default -> 0.075s
     WD_TXBX_CLICK_TIME = 0.15 # Default -> 0.15s
 
+class cfgcache:
+    """
+    settings the memory budget of the engine caches
+    """
+    
+    RECT_CACHE_BYTES = 8 * 1024 * 1024 # Default -> 8MB, draw_rect surfaces with alpha
+    TEXT_CACHE_BYTES = 16 * 1024 * 1024 # Default -> 16MB, draw_text rendered texts
+    IMAGE_CACHE_BYTES = 64 * 1024 * 1024 # Default -> 64MB, loadImage images not in use(released)
+    SHAPE_CACHE_BYTES = 8 * 1024 * 1024 # Default -> 8MB, draw_circle and draw_rounded_rect shapes
+
+class cfgnetwork:
+    """
+    settings for the online features of the engine
+    """
+
+    VERSION_URL = 'https://raw.githubusercontent.com/MrJuaumBR/maxpygame/main/data.json'
+    TIMEOUT = 2.0 # Default -> 2s, hard limit for any download
+    VERSION_CACHE_TTL = 86400 # Default -> 1 day
+    CACHE_DIR = os.path.join(os.path.expanduser('~'), '.maxpygame') # Default -> ~/.maxpygame
+    OFFLINE_ENV = 'MAXPYGAME_OFFLINE' # Set to 1 to disable every online feature
+
+# Rects
+def merge_rects(rects:list[pg.Rect,]) -> list[pg.Rect,]:
+    """
+    Merge the rects that overlap, empty rects are dropped
+    
+    Parameters:
+        rects:list[pg.Rect,]
+    Returns:
+        list[pg.Rect,]
+    """
+    merged = []
+    for rect in rects:
+        if rect.width <= 0 or rect.height <= 0:
+            continue
+        i = rect.collidelist(merged)
+        while i != -1:
+            rect = rect.union(merged.pop(i))
+            i = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
 # Color
 def hex_to_rgb(hex:str) -> tuple[int,int,int]:
     return tuple(int(hex.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))
@@ -131,6 +254,7 @@ class RGB:
         self.brightness = round((self.r + self.g + self.b) / 765, 3)
         
     def random(self):
+        import random
         self.r = random.randint(0, 255)
         self.g = random.randint(0, 255)
         self.b = random.randint(0, 255)
@@ -155,55 +279,87 @@ class HEX:
     def rgb(self) -> tuple[int,int,int]:
         return hex_to_rgb(self.hex)
     
-class color():
-    _rgb:RGB
-    _hex:HEX
-    brightness:float = 0
-    def __init__(self, r:int, g:int, b:int,hex:str=None):
-        if hex is not None:
-            self._rgb = RGB(*hex_to_rgb(hex)) # Convert hex to rgb, and validate color(limit > 0 & < 255)
-            self._hex = HEX(self._rgb.hex()) # Convert rgb to hex after validating
-        else:
-            self._rgb = RGB(r, g, b) # Validate color
-            self._hex = HEX(self._rgb.hex()) # Convert rgb to hex after validating
-        self.brightness = self._rgb.brightness
+class color:
+    """
+    Immutable color, everything is computed once when it is created:
+    rgb(tuple), hex(str), packed(int, 0xRRGGBB) and brightness(0 to 1).
     
-    @property
-    def rgb(self) -> RGB:
-        return self._rgb
+    Values are limited to 0-255, color.from_hex reuses the color of a hex string already seen.
+    """
+    __slots__ = ('r', 'g', 'b', 'rgb', 'hex', 'packed', 'brightness')
+    _interned:dict = {} # hex string: color
+    _MAX_INTERNED:int = 4096
+    def __init__(self, r:int=0, g:int=0, b:int=0, hex:str=None):
+        if hex is not None:
+            r, g, b = hex_to_rgb(hex)
+        r = 0 if r < 0 else 255 if r > 255 else int(r)
+        g = 0 if g < 0 else 255 if g > 255 else int(g)
+        b = 0 if b < 0 else 255 if b > 255 else int(b)
+        init = object.__setattr__
+        init(self, 'r', r)
+        init(self, 'g', g)
+        init(self, 'b', b)
+        init(self, 'rgb', (r, g, b))
+        init(self, 'hex', rgb_to_hex(r, g, b))
+        init(self, 'packed', (r << 16) | (g << 8) | b)
+        init(self, 'brightness', round((r + g + b) / 765, 3))
     
-    @rgb.setter
-    def rgb(self, rgb:tuple[int,int,int]):
-        r,g,b = rgb
-        self._rgb = RGB(r, g, b) # Validate color
-        self._hex = HEX(self._rgb.hex()) # Convert rgb to hex after validating
-        self.brightness = self._rgb.brightness
+    @classmethod
+    def from_hex(cls, hex:str) -> 'color':
+        """
+        Get the color of a hex string, parsed only the first time
         
-    @rgb.getter
-    def rgb(self) -> tuple[int,int,int]:
-        return self._rgb.rgb()
+        Parameters:
+            hex:str - '#rrggbb' or 'rrggbb'
+        Returns:
+            color
+        """
+        found = cls._interned.get(hex)
+        if found is None:
+            if len(cls._interned) >= cls._MAX_INTERNED:
+                cls._interned.clear()
+            found = cls._interned[hex] = cls(hex=hex)
+        return found
+    
+    def __setattr__(self, name:str, value):
+        raise AttributeError('color is immutable, create a new one')
+    
+    def __delattr__(self, name:str):
+        raise AttributeError('color is immutable')
+    
+    def __eq__(self, other) -> bool:
+        if type(other) is color:
+            return self.packed == other.packed
+        return NotImplemented
+    
+    def __hash__(self) -> int:
+        return self.packed
+    
+    def __iter__(self):
+        return iter(self.rgb)
+    
+    def __repr__(self) -> str:
+        return f'color({self.r}, {self.g}, {self.b})'
     
     @property
-    def hex(self) -> HEX:
-        return self._hex
+    def _rgb(self) -> RGB:
+        return RGB(self.r, self.g, self.b)
     
-    @hex.setter
-    def hex(self, hex:str):
-        self._rgb = RGB(*hex_to_rgb(hex)) # Convert hex to rgb, and validate color(limit > 0 & < 255)
-        self._hex = HEX(self._rgb.hex()) # Convert rgb to hex after validating
-        self.brightness = self._rgb.brightness
-        
-    @hex.getter
-    def hex(self) -> str:
-        return self._hex.ghex()
+    @property
+    def _hex(self) -> HEX:
+        return HEX(self.hex)
         
 class spritesheet(object):
     """
     Object for spritesheet
+    
+    Sprites are subsurfaces of the sheet(views, no pixels copied),
+    each one is created once and kept in self.frames.
     """
     image:pg.Surface
     image_path:str
     engine:object
+    frames:dict[tuple,pg.Surface]
     def __init__(self, engine,image_path:str):
         """
         Load an image from a path
@@ -215,31 +371,148 @@ class spritesheet(object):
         """
         self.image_path = image_path
         self.engine = engine
+        self.frames = {}
         try:
-            self.image = self.engine.loadImage(image_path).convert()
+            image = self.engine.loadImage(image_path, cached=True) # The frames only read it
         except pg.error as message:
             print('Unable to load spritesheet image:', image_path)
             raise SystemExit(message)
+        # Already in the screen format, keeps the transparency of png sheets
+        self.image = image
         
-    def image_at(self, rect:tuple[int,int,int,int], colorkey=None):
+    def image_at(self, rect:tuple[int,int,int,int], colorkey=None) -> pg.SurfaceType:
         """
         Get the sprite from the spritesheet
         
-        x, y, x+offset, y+offset
+        x, y, width, height
         
         Parameters:
             rect:tuple[int,int,int,int]
-            colorkey:int
+            colorkey(Optional):int or color, -1 for the color of the top left pixel of the sprite
         Returns:
-            pg.SurfaceType
+            pg.SurfaceType - Shares the pixels with the sheet, copy() it before drawing on it
         """
-        image = pg.Surface(rect.size).convert()
-        image.blit(self.sheet, (0,0), rect)
-        if colorkey is not None:
-            if colorkey == -1:
-                colorkey = image.get_at((0,0))
-            image.set_colorkey(colorkey, pg.RLEACCEL)
+        rect = tuple(rect)
+        if colorkey is not None and type(colorkey) is not int:
+            colorkey = tuple(colorkey) # Lists and pg.Color can't be dict keys
+        key = (rect, colorkey)
+        image = self.frames.get(key)
+        if image is None:
+            image = self.image.subsurface(rect)
+            if colorkey is not None:
+                if colorkey == -1:
+                    colorkey = image.get_at((0,0))
+                image.set_colorkey(colorkey)
+            self.frames[key] = image
         return image
     
-    def images_at(self, rects:list[tuple[int,int,int,int]], colorkey=None):
-        return [self.image_at(rect, colorkey) for rect in rects]
\ No newline at end of file
+    def images_at(self, rects:list[tuple[int,int,int,int]], colorkey=None) -> list[pg.SurfaceType,]:
+        return [self.image_at(rect, colorkey) for rect in rects]
+    
+    def load_strip(self, rect:tuple[int,int,int,int], image_count:int, colorkey=None) -> list[pg.SurfaceType,]:
+        """
+        Get image_count sprites side by side, starting at rect
+        
+        Parameters:
+            rect:tuple[int,int,int,int] - The first sprite
+            image_count:int
+            colorkey(Optional):int or color
+        Returns:
+            list[pg.SurfaceType,]
+        """
+        x, y, w, h = rect
+        return self.images_at([(x + w * i, y, w, h) for i in range(image_count)], colorkey)
+    
+    def load_grid(self, size:tuple[int,int], colorkey=None, count:int=None, margin:int=0, spacing:int=0) -> list[pg.SurfaceType,]:
+        """
+        Get all the sprites of a sheet made of cells of the same size, row by row
+        
+        Parameters:
+            size:tuple[int,int] - Size of a sprite
+            colorkey(Optional):int or color
+            count(Optional):int - Sprites to get, Defaults to all the cells
+            margin(Optional):int - Space around the grid
+            spacing(Optional):int - Space between cells
+        Returns:
+            list[pg.SurfaceType,]
+        """
+        w, h = size
+        sheet_w, sheet_h = self.image.get_size()
+        cols = (sheet_w - 2 * margin + spacing) // (w + spacing)
+        rows = (sheet_h - 2 * margin + spacing) // (h + spacing)
+        rects = [(margin + col * (w + spacing), margin + row * (h + spacing), w, h) for row in range(rows) for col in range(cols)]
+        return self.images_at(rects if count is None else rects[:count], colorkey)
+    
+class Animation:
+    """
+    Frames shown one after the other, by time(not by frames drawn),
+    the animation has the same speed at any FPS.
+    
+    Animation.image is the frame of now.
+    """
+    frames:list[pg.Surface]
+    frame_time:float
+    loop:bool = True
+    def __init__(self, frames:list[pg.Surface], frame_time:float=0.1, loop:bool=True, clock:callable=time.monotonic):
+        """
+        Parameters:
+            frames:list[pg.Surface] - e.g. from spritesheet.load_strip or load_grid
+            frame_time(Optional):float - Seconds per frame, Defaults to 0.1
+            loop(Optional):bool - Start again at the end, or stay on the last frame
+            clock(Optional):callable - Seconds, Defaults to time.monotonic
+        """
+        self.frames = list(frames)
+        self.frame_time = frame_time
+        self.loop = loop
+        self.clock = clock
+        self._start = clock()
+        self._paused_at = None
+    
+    def __len__(self) -> int:
+        return len(self.frames)
+    
+    @property
+    def elapsed(self) -> float:
+        return (self._paused_at if self._paused_at is not None else self.clock()) - self._start
+    
+    @property
+    def index(self) -> int:
+        """
+        Number of the frame of now
+        """
+        i = int(self.elapsed / self.frame_time)
+        if self.loop:
+            return i % len(self.frames)
+        return min(i, len(self.frames) - 1)
+    
+    @property
+    def image(self) -> pg.Surface:
+        return self.frames[self.index]
+    
+    @property
+    def done(self) -> bool:
+        """
+        If an animation without loop reached the last frame
+        """
+        return not self.loop and self.elapsed >= self.frame_time * len(self.frames)
+    
+    @property
+    def paused(self) -> bool:
+        return self._paused_at is not None
+    
+    def pause(self):
+        if self._paused_at is None:
+            self._paused_at = self.clock()
+    
+    def play(self):
+        if self._paused_at is not None:
+            self._start += self.clock() - self._paused_at
+            self._paused_at = None
+    
+    def reset(self):
+        self._start = self.clock()
+        if self._paused_at is not None:
+            self._paused_at = self._start
+    
+    def draw(self, screen:pg.SurfaceType, position:tuple[int,int]) -> pg.Rect:
+        return screen.blit(self.image, position)
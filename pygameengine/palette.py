@@ -0,0 +1,295 @@
+"""
+A File designed to work on many colors at once for the engine, needs numpy.
+
+- Palette: colors as a numpy array, conversions, brightness, contrast, blending, gradients and nearest color;
+"""
+from __future__ import annotations
+from .objects import color as reqColor
+
+np = None # numpy, imported on the first use so the module can be imported without it
+
+def _numpy():
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError as error:
+            raise ModuleNotFoundError('Palette needs numpy, please install it: python -m pip install maxpygame[palette]') from error
+        np = numpy
+    return np
+
+def _hex6(h:str) -> str:
+    # '#rgb', '#rgba', '#rrggbb' or '#rrggbbaa' to 'rrggbb', alpha is dropped
+    digits = h.lstrip('#')
+    n = len(digits)
+    if n == 3 or n == 4:
+        return ''.join(c * 2 for c in digits[:3])
+    if n == 6 or n == 8:
+        return digits[:6]
+    raise ValueError(f'Invalid hex color {h!r}, use #rgb, #rgba, #rrggbb or #rrggbbaa')
+
+def _one_rgb(value) -> tuple:
+    # One color of a mixed list to rgb
+    if type(value) is str:
+        return tuple(hex_to_rgb([value])[0].tolist())
+    if type(value) is reqColor:
+        return value.rgb
+    value = tuple(value)
+    if len(value) not in (3, 4):
+        raise ValueError(f'Colors must be rgb or rgba values, got {value!r}')
+    return value[:3]
+
+def _as_rgb(colors) -> np.ndarray:
+    # Palette, color, hex strings or rgb(a) values, alone or in a list(mixed too), to an (N, 3) float array
+    _numpy()
+    if isinstance(colors, Palette):
+        return colors.rgb.astype(np.float64)
+    if type(colors) is reqColor or type(colors) is str:
+        colors = [colors]
+    if not isinstance(colors, np.ndarray):
+        colors = list(colors)
+        if all(type(c) is str for c in colors):
+            return hex_to_rgb(colors).astype(np.float64) if colors else np.zeros((0, 3))
+        if all(type(c) is reqColor for c in colors):
+            return np.array([c.rgb for c in colors], dtype=np.float64)
+        if any(type(c) is str or type(c) is reqColor for c in colors):
+            colors = [_one_rgb(c) for c in colors] # Mixed, each one on its own
+        elif colors and not hasattr(colors[0], '__len__'):
+            colors = [colors] # One rgb value, e.g. (255, 0, 0)
+    try:
+        array = np.asarray(colors, dtype=np.float64)
+    except (ValueError, TypeError) as error:
+        raise ValueError('Colors must be rgb or rgba values, all with the same length') from error
+    if array.size == 0:
+        return np.zeros((0, 3))
+    if array.ndim == 1:
+        array = array[None]
+    if array.ndim != 2 or array.shape[1] not in (3, 4):
+        raise ValueError(f'Colors must be rgb or rgba values, got an array of shape {array.shape}')
+    return array[:, :3]
+
+def hex_to_rgb(hexes:list[str,]) -> np.ndarray:
+    """
+    Convert hex strings('#rgb', '#rrggbb', with or without '#', alpha digits are dropped) to an (N, 3) uint8 array
+
+    Parameters:
+        hexes:list[str,]
+    Returns:
+        np.ndarray
+    """
+    _numpy()
+    try:
+        data = bytes.fromhex(''.join(_hex6(h) for h in hexes))
+    except ValueError as error:
+        raise ValueError(f'Invalid hex color in {list(hexes)!r}') from error
+    return np.frombuffer(data, dtype=np.uint8).reshape(-1, 3).copy()
+
+def rgb_to_hex(rgb:np.ndarray) -> list[str,]:
+    """
+    Convert an (N, 3) array to hex strings('#rrggbb')
+
+    Parameters:
+        rgb:np.ndarray
+    Returns:
+        list[str,]
+    """
+    _numpy()
+    return np.char.mod('#%06x', pack(rgb)).tolist()
+
+def pack(rgb:np.ndarray) -> np.ndarray:
+    """
+    Convert an (N, 3) array to ints 0xRRGGBB, like color.packed
+    """
+    _numpy()
+    rgb = np.clip(np.rint(rgb), 0, 255).astype(np.uint32)
+    return (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]
+
+def unpack(packed:np.ndarray) -> np.ndarray:
+    """
+    Convert ints 0xRRGGBB to an (N, 3) uint8 array
+    """
+    _numpy()
+    packed = np.asarray(packed, dtype=np.uint32)
+    return np.stack(((packed >> 16) & 255, (packed >> 8) & 255, packed & 255), axis=1).astype(np.uint8)
+
+def brightness(rgb:np.ndarray) -> np.ndarray:
+    """
+    Brightness from 0 to 1, the same of color.brightness(not rounded)
+    """
+    _numpy()
+    return np.asarray(rgb, dtype=np.float64).sum(axis=1) / 765
+
+def luminance(rgb:np.ndarray) -> np.ndarray:
+    """
+    Relative luminance(WCAG) from 0 to 1
+    """
+    _numpy()
+    c = np.asarray(rgb, dtype=np.float64) / 255
+    c = np.where(c <= 0.03928, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    return c @ np.array([0.2126, 0.7152, 0.0722])
+
+def contrast(a:np.ndarray, b:np.ndarray) -> np.ndarray:
+    """
+    Contrast ratio(WCAG) from 1 to 21, 4.5 or more is readable text
+    """
+    la = luminance(a)
+    lb = luminance(b)
+    return (np.maximum(la, lb) + 0.05) / (np.minimum(la, lb) + 0.05)
+
+class Palette:
+    """
+    Named colors as an (N, 3) uint8 array, every operation works on all the colors at once.
+
+    Colors can be given as a Palette, colors, hex strings or rgb(a) values, alone or in a list(mixed too).
+    nearest() uses a KD-tree from scipy when it is installed, if not it compares with all the colors.
+    """
+    def __init__(self, names:list[str,], rgb):
+        """
+        Parameters:
+            names:list[str,]
+            rgb:(N, 3) or (N, 4) array, or list of rgb(a) values
+        """
+        _numpy()
+        self.names:list[str,] = list(names)
+        self.rgb:np.ndarray = np.clip(_as_rgb(rgb), 0, 255).astype(np.uint8) # rgba values lose the alpha
+        if len(self.names) != len(self.rgb):
+            raise ValueError(f'{len(self.names)} names for {len(self.rgb)} colors')
+        self._index:dict[str,int] = {name: i for i, name in enumerate(self.names)}
+        self._tree = None
+
+    @classmethod
+    def from_colors(cls, colors) -> 'Palette':
+        """
+        Palette of the colors of a Colors(without aliases)
+
+        Parameters:
+            colors:Colors
+        Returns:
+            Palette
+        """
+        aliases = set(colors.aliases)
+        items = [(name, value.rgb) for name, value in colors.__dict__.items() if type(value) is reqColor and name not in aliases]
+        return cls([name for name, _ in items], [rgb for _, rgb in items])
+
+    @classmethod
+    def from_hex(cls, names:list[str,], hexes:list[str,]) -> 'Palette':
+        return cls(names, hex_to_rgb(hexes))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name:str) -> bool:
+        return name in self._index
+
+    def __getitem__(self, name:str) -> reqColor:
+        return reqColor(*self.rgb[self._index[name]].tolist())
+
+    def __repr__(self) -> str:
+        return f'Palette({len(self)} colors)'
+
+    def colors(self) -> list[reqColor,]:
+        return [reqColor(*rgb) for rgb in self.rgb.tolist()]
+
+    # Conversions
+    def hex(self) -> list[str,]:
+        return rgb_to_hex(self.rgb)
+
+    def packed(self) -> np.ndarray:
+        return pack(self.rgb)
+
+    # Analysis
+    def brightness(self) -> np.ndarray:
+        return brightness(self.rgb)
+
+    def luminance(self) -> np.ndarray:
+        return luminance(self.rgb)
+
+    def contrast(self, other) -> np.ndarray:
+        """
+        Contrast ratio of each color with other(one color or one per color)
+
+        Parameters:
+            other:color, str or colors
+        Returns:
+            np.ndarray - From 1 to 21
+        """
+        return contrast(self.rgb, _as_rgb(other))
+
+    def readable_text(self, light=(255, 255, 255), dark=(0, 0, 0)) -> np.ndarray:
+        """
+        The text color with more contrast on each color
+
+        Returns:
+            np.ndarray - (N, 3) uint8
+        """
+        light = _as_rgb(light)
+        dark = _as_rgb(dark)
+        use_light = self.contrast(light) >= self.contrast(dark)
+        return np.where(use_light[:, None], light, dark).astype(np.uint8)
+
+    # Mixing
+    def blend(self, other, t:float=0.5) -> 'Palette':
+        """
+        Mix each color with other, t 0 keeps the color and 1 is other
+
+        Parameters:
+            other:color, str or colors(one per color)
+            t(Optional):float or array - Defaults to 0.5
+        Returns:
+            Palette - With the same names
+        """
+        t = np.asarray(t, dtype=np.float64).reshape(-1, 1)
+        a = self.rgb.astype(np.float64)
+        return Palette(self.names, np.rint(a + (_as_rgb(other) - a) * t))
+
+    @staticmethod
+    def gradient(start, end, steps:int) -> np.ndarray:
+        """
+        Colors from start to end(both included)
+
+        Parameters:
+            start:color, str or rgb
+            end:color, str or rgb
+            steps:int
+        Returns:
+            np.ndarray - (steps, 3) uint8
+        """
+        a = _as_rgb(start)
+        t = np.linspace(0, 1, steps)[:, None]
+        b = _as_rgb(end)
+        return np.rint(a + (b - a) * t).astype(np.uint8)
+
+    # Search
+    def nearest(self, colors, budget:int=1 << 20) -> tuple[list[str,],np.ndarray]:
+        """
+        Name of the palette color nearest(rgb distance) to each color
+
+        Parameters:
+            colors:color, str or colors
+            budget(Optional):int - Distances computed at once without scipy, limits the memory
+        Returns:
+            tuple[list[str,],np.ndarray] - Names and distances
+        """
+        if not len(self):
+            raise ValueError('The palette is empty')
+        query = _as_rgb(colors)
+        if self._tree is None:
+            try:
+                from scipy.spatial import cKDTree
+                self._tree = cKDTree(self.rgb.astype(np.float64))
+            except ImportError: # Missing or broken scipy
+                self._tree = False
+        if self._tree is not False:
+            distances, index = self._tree.query(query)
+        else:
+            points = self.rgb.astype(np.float64)
+            chunk = max(1, budget // len(points)) # Colors compared at once, less with bigger palettes
+            index = np.empty(len(query), dtype=np.intp)
+            distances = np.empty(len(query))
+            for i in range(0, len(query), chunk):
+                part = query[i:i + chunk]
+                d = ((part[:, None, :] - points[None, :, :]) ** 2).sum(axis=2)
+                index[i:i + chunk] = d.argmin(axis=1)
+                distances[i:i + chunk] = np.sqrt(d[np.arange(len(part)), index[i:i + chunk]])
+        names = self.names
+        return [names[i] for i in index.tolist()], distances
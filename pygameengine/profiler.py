@@ -0,0 +1,185 @@
+"""
+A File designed to measure where the time of the frames goes.
+
+- FrameProfiler: per-phase and per-widget-type timings of the last frames, graph and JSON/CSV export;
+"""
+import csv, json, time
+from collections import deque
+from .required import pg
+
+PHASES = ('events', 'widgets_update', 'widgets_draw', 'user', 'display', 'tick')
+PHASE_COLORS = {
+    'events': (80, 160, 255),
+    'widgets_update': (255, 160, 40),
+    'widgets_draw': (255, 220, 60),
+    'user': (90, 220, 120),
+    'display': (220, 90, 220),
+    'tick': (70, 70, 70),
+}
+
+class FrameProfiler:
+    """
+    Timings of the last frames, kept in a ring buffer(old frames are dropped).
+
+    A frame ends in PyGameEngine.update, phases not measured by the engine
+    (your own draw calls and logic) are counted as 'user'.
+    widgets_update is the events sent to the widgets and their update(),
+    widgets_draw is composing and drawing them.
+    Times are in milliseconds.
+    """
+    graph:bool = False
+    graph_size:tuple[int,int] = (300, 80)
+    graph_scale:float = 2 # Pixels per millisecond
+    def __init__(self, frames:int=300, graph:bool=False):
+        """
+        Parameters:
+            frames(Optional):int - Size of the ring buffer, Defaults to 300
+            graph(Optional):bool - Draw the graph on the screen, Defaults to False
+        """
+        self.frames:deque[dict] = deque(maxlen=frames)
+        self.graph = graph
+        self.count:int = 0
+        self._phases:dict[str,float] = dict.fromkeys(PHASES, 0.0)
+        self._widgets:dict[str,list] = {}
+        self._start:float = time.perf_counter()
+        self._surface:pg.SurfaceType = None
+
+    def add(self, phase:str, seconds:float):
+        self._phases[phase] += seconds
+
+    def add_widget(self, type:str, seconds:float):
+        slot = self._widgets.get(type)
+        if slot is None:
+            slot = self._widgets[type] = [0.0, 0]
+        slot[0] += seconds
+        slot[1] += 1
+
+    def end_frame(self) -> dict:
+        """
+        Close the current frame and store it
+
+        Returns:
+            dict - frame, total, a key per phase and widgets({type: [ms, count]})
+        """
+        now = time.perf_counter()
+        phases = self._phases
+        total = now - self._start
+        phases['user'] = max(0.0, total - sum(phases.values()))
+        frame = {'frame': self.count, 'total': total * 1000}
+        for phase in PHASES:
+            frame[phase] = phases[phase] * 1000
+        frame['widgets'] = {type: [seconds * 1000, n] for type, (seconds, n) in self._widgets.items()}
+        self.frames.append(frame)
+        self.count += 1
+        self._phases = dict.fromkeys(PHASES, 0.0)
+        self._widgets = {}
+        self._start = now
+        if self._surface is not None:
+            self._graph_column(frame)
+        return frame
+
+    def stats(self) -> dict:
+        """
+        Average, max and 95th percentile of each phase(and the total) over the stored frames
+
+        Returns:
+            dict - {phase: {'avg', 'max', 'p95'}, 'widgets': {type: {'avg', 'count'}}}
+        """
+        result = {}
+        n = len(self.frames)
+        for key in ('total',) + PHASES:
+            values = sorted(frame[key] for frame in self.frames)
+            result[key] = {
+                'avg': sum(values) / n if n else 0,
+                'max': values[-1] if n else 0,
+                'p95': values[min(n - 1, int(n * 0.95))] if n else 0,
+            }
+        widgets = {}
+        for frame in self.frames:
+            for type, (ms, count) in frame['widgets'].items():
+                slot = widgets.setdefault(type, [0.0, 0])
+                slot[0] += ms
+                slot[1] += count
+        result['widgets'] = {type: {'avg': ms / n, 'count': count / n} for type, (ms, count) in widgets.items()}
+        return result
+
+    def spikes(self, ms:float) -> list[dict,]:
+        """
+        Stored frames that took longer than ms
+
+        Parameters:
+            ms:float
+        Returns:
+            list[dict,]
+        """
+        return [frame for frame in self.frames if frame['total'] > ms]
+
+    def to_json(self, path:str):
+        """
+        Save the stored frames as JSON
+
+        Parameters:
+            path:str
+        Returns:
+            None
+        """
+        with open(path, 'w') as f:
+            json.dump({'phases': PHASES, 'frames': list(self.frames)}, f, indent=1)
+
+    def to_csv(self, path:str):
+        """
+        Save the stored frames as CSV, a column per phase and per widget type(ms)
+
+        Parameters:
+            path:str
+        Returns:
+            None
+        """
+        types = sorted({type for frame in self.frames for type in frame['widgets']})
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame', 'total'] + list(PHASES) + [f'widget:{type}' for type in types])
+            for frame in self.frames:
+                widgets = frame['widgets']
+                writer.writerow([frame['frame'], round(frame['total'], 4)] + [round(frame[phase], 4) for phase in PHASES]
+                                + [round(widgets[type][0], 4) if type in widgets else 0 for type in types])
+
+    def clear(self):
+        self.frames.clear()
+        self._surface = None
+
+    # Graph
+    def _graph_column(self, frame:dict):
+        # The graph scrolls 1 pixel per frame, only the new column is drawn
+        surface = self._surface
+        w, h = surface.get_size()
+        surface.scroll(-1, 0)
+        surface.fill((0, 0, 0, 160), (w - 1, 0, 1, h))
+        y = h
+        for phase in PHASES:
+            size = frame[phase] * self.graph_scale
+            if size > 0:
+                surface.fill(PHASE_COLORS[phase], (w - 1, y - size, 1, size + 1))
+                y -= size
+        budget = h - 1000 / 60 * self.graph_scale # 60 FPS line
+        if budget > 0:
+            surface.set_at((w - 1, int(budget)), (255, 255, 255))
+
+    def draw(self, target:pg.SurfaceType, position:tuple[int,int]=None) -> pg.Rect:
+        """
+        Draw the frame time graph(one column per frame, a color per phase, white line at 60 FPS)
+
+        Parameters:
+            target:pg.SurfaceType
+            position(Optional):tuple[int,int] - Defaults to the top right corner
+        Returns:
+            pg.Rect
+        """
+        if self._surface is None:
+            self._surface = pg.Surface(self.graph_size, pg.SRCALPHA)
+            self._surface.fill((0, 0, 0, 160))
+            for frame in list(self.frames)[-self.graph_size[0]:]:
+                self._graph_column(frame)
+        if position is None:
+            position = (target.get_width() - self.graph_size[0], 0)
+        return target.blit(self._surface, position)
@@ -0,0 +1,131 @@
+"""
+A File designed to keep the widgets of an engine.
+
+- WidgetRegistry: widgets by id, in draw order;
+"""
+from .excptions import *
+
+class WidgetRegistry:
+    """
+    Widgets of an engine, keyed by id.
+
+    Finding or removing a widget by id doesn't look at the other widgets.
+    Iterating gives the widgets in draw order(first added first, bottom to top),
+    the order is kept when widgets are removed.
+    """
+    def __init__(self):
+        self._widgets:dict[str,object] = {} # Dicts keep the insertion order
+        self._counter:int = 0
+        self._ordered:tuple = None # Snapshot for iteration, dropped when the registry changes
+
+    def __len__(self) -> int:
+        return len(self._widgets)
+
+    def __iter__(self):
+        return iter(self.ordered())
+
+    def __contains__(self, widget) -> bool:
+        if isinstance(widget, str):
+            return widget in self._widgets
+        return self._widgets.get(getattr(widget, '_id', None)) is widget
+
+    def __getitem__(self, id:str):
+        return self._widgets[id]
+
+    def __repr__(self) -> str:
+        return f'WidgetRegistry({list(self._widgets)})'
+
+    def next_order(self) -> int:
+        """
+        Reserve the next draw order(also used for default ids)
+
+        Returns:
+            int
+        """
+        order = self._counter
+        self._counter += 1
+        return order
+
+    def new_id(self, prefix:str) -> str:
+        """
+        Make an id that isn't used, prefix and the next draw order(skipping the ids taken by hand)
+
+        Parameters:
+            prefix:str
+        Returns:
+            str
+        """
+        id = f'{prefix}{self.next_order()}'
+        while id in self._widgets:
+            id = f'{prefix}{self.next_order()}'
+        return id
+
+    def ordered(self) -> tuple:
+        """
+        Widgets in draw order, safe to iterate while widgets are added or removed
+
+        Returns:
+            tuple
+        """
+        if self._ordered is None:
+            self._ordered = tuple(self._widgets.values())
+        return self._ordered
+
+    def add(self, widget):
+        """
+        Add a widget on top of the others
+
+        Parameters:
+            widget:Widget
+        Returns:
+            None
+        """
+        old = self._widgets.get(widget._id)
+        if old is not None and old is not widget:
+            raise(WidgetIdError(widget._id))
+        self._widgets.pop(widget._id, None)
+        widget._order = self.next_order()
+        self._widgets[widget._id] = widget
+        self._ordered = None
+
+    def get(self, id:str):
+        """
+        Get a widget by its id
+
+        Parameters:
+            id:str
+        Returns:
+            Widget or None
+        """
+        return self._widgets.get(id)
+
+    def remove(self, id:str):
+        """
+        Remove a widget by its id
+
+        Parameters:
+            id:str
+        Returns:
+            Widget or None - The removed widget
+        """
+        widget = self._widgets.pop(id, None)
+        if widget is not None:
+            self._ordered = None
+        return widget
+
+    def raise_to_top(self, id:str):
+        """
+        Move a widget over all the others
+
+        Parameters:
+            id:str
+        Returns:
+            None
+        """
+        widget = self._widgets.get(id)
+        if widget is not None:
+            self.add(widget)
+
+    def clear(self):
+        self._widgets.clear()
+        self._ordered = None
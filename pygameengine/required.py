@@ -1,15 +1,13 @@
 """
 A File designed only to import things for all the project.
+
+Keep it small, everything here is paid by `import pygameengine`.
+Heavy or optional modules (requests, numpy...) are imported where they are used.
 """
-import math, os, random, sys, time, requests
+import os, sys, time
 try:
     import pygame as pg
     from pygame.locals import *
-except ModuleNotFoundError:
-    print('PyGame not installed, installing...')
-    os.system('python -m pip install pygame')
-    print('Installed.')
-    import pygame as pg
-    from pygame.locals import *
-import inspect
+except ModuleNotFoundError as error:
+    raise ModuleNotFoundError('PyGame not installed, please install it: python -m pip install pygame') from error
 from .excptions import *
\ No newline at end of file
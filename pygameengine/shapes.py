@@ -0,0 +1,76 @@
+"""
+A File designed to keep pre-rendered shapes for the engine.
+
+- ShapeCache: circles, rings and rounded rects rendered once(optionally anti-aliased) and reused;
+"""
+from .required import pg
+from .cache import SurfaceCache
+
+SUPERSAMPLE = 4 # Anti-aliased shapes are drawn this many times bigger and scaled down
+
+def _render(size:tuple[int,int], color:tuple, antialias:bool, draw:callable) -> pg.SurfaceType:
+    # draw(surface, scale) draws the shape on a transparent surface
+    if not antialias:
+        surface = pg.Surface(size, pg.SRCALPHA)
+        draw(surface, 1)
+        return surface
+    big = pg.Surface((size[0] * SUPERSAMPLE, size[1] * SUPERSAMPLE), pg.SRCALPHA)
+    big.fill((*color[:3], 0)) # Transparent with the same color, the edges don't get dark when scaled
+    draw(big, SUPERSAMPLE)
+    return pg.transform.smoothscale(big, size)
+
+class ShapeCache(SurfaceCache):
+    """
+    LRU cache of rendered shapes, keyed by shape, size, color, alpha, width and antialias.
+
+    Drawing a shape that was already rendered is one blit.
+    """
+    def circle(self, radius:int, color:tuple, alpha:int=255, width:int=0, antialias:bool=False) -> pg.SurfaceType:
+        """
+        Get a circle, or a ring if width > 0
+
+        Parameters:
+            radius:int
+            color:tuple - rgb or rgba
+            alpha(Optional):int
+            width(Optional):int - Ring thickness, 0 is filled
+            antialias(Optional):bool
+        Returns:
+            pg.SurfaceType - Size radius*2
+        """
+        radius = int(radius)
+        key = ('circle', radius, color, alpha, width, antialias)
+        surface = self.get(key)
+        if surface is None:
+            size = (radius * 2, radius * 2)
+            def draw(target, scale):
+                pg.draw.ellipse(target, color, (0, 0, size[0] * scale, size[1] * scale), width * scale)
+            surface = _render(size, color, antialias, draw)
+            surface.set_alpha(alpha)
+            self.put(key, surface)
+        return surface
+
+    def rounded_rect(self, size:tuple[int,int], color:tuple, radius:int, alpha:int=255, width:int=0, antialias:bool=False) -> pg.SurfaceType:
+        """
+        Get a rect with rounded corners, only the border if width > 0
+
+        Parameters:
+            size:tuple[int,int]
+            color:tuple - rgb or rgba
+            radius:int - Corners radius
+            alpha(Optional):int
+            width(Optional):int - Border thickness, 0 is filled
+            antialias(Optional):bool
+        Returns:
+            pg.SurfaceType
+        """
+        size = (int(size[0]), int(size[1]))
+        key = ('rounded_rect', size, color, radius, alpha, width, antialias)
+        surface = self.get(key)
+        if surface is None:
+            def draw(target, scale):
+                pg.draw.rect(target, color, (0, 0, size[0] * scale, size[1] * scale), width * scale, border_radius=radius * scale)
+            surface = _render(size, color, antialias, draw)
+            surface.set_alpha(alpha)
+            self.put(key, surface)
+        return surface
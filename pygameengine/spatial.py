@@ -0,0 +1,127 @@
+"""
+A File designed to find things by position for the engine.
+
+- SpatialGrid: uniform grid of rects, used for widget hit-testing;
+"""
+from .required import pg
+
+class SpatialGrid:
+    """
+    Uniform grid over rects.
+
+    Each item is kept in the cells its rect touches, so finding the items
+    under a point only looks at one cell, no matter how many items there are.
+    Items are updated incrementally, moving an item only touches its old and new cells.
+    """
+    cell_size:int = 64
+    def __init__(self, cell_size:int=None):
+        """
+        Parameters:
+            cell_size(Optional):int - Size of a cell in pixels, Defaults to 64
+        """
+        if cell_size is not None:
+            self.cell_size = cell_size
+        self.cells:dict[tuple[int,int],set] = {}
+        self.rects:dict[object,tuple[int,int,int,int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.rects)
+
+    def __contains__(self, item:object) -> bool:
+        return item in self.rects
+
+    def _cells(self, rect:tuple[int,int,int,int]):
+        x, y, w, h = rect
+        cs = self.cell_size
+        for cx in range(int(x // cs), int((x + max(w, 1) - 1) // cs) + 1):
+            for cy in range(int(y // cs), int((y + max(h, 1) - 1) // cs) + 1):
+                yield (cx, cy)
+
+    def update(self, item:object, rect:pg.Rect) -> bool:
+        """
+        Insert an item or move it if its rect changed
+
+        Parameters:
+            item:object
+            rect:pg.Rect
+        Returns:
+            bool - If the grid changed
+        """
+        rect = tuple(rect)
+        old = self.rects.get(item)
+        if old == rect:
+            return False
+        if old is not None:
+            self._unlink(item, old)
+        self.rects[item] = rect
+        if rect[2] > 0 and rect[3] > 0:
+            for cell in self._cells(rect):
+                bucket = self.cells.get(cell)
+                if bucket is None:
+                    bucket = self.cells[cell] = set()
+                bucket.add(item)
+        return True
+
+    def remove(self, item:object):
+        """
+        Remove an item, does nothing if it isn't in the grid
+
+        Parameters:
+            item:object
+        Returns:
+            None
+        """
+        old = self.rects.pop(item, None)
+        if old is not None:
+            self._unlink(item, old)
+
+    def _unlink(self, item:object, rect:tuple[int,int,int,int]):
+        if rect[2] <= 0 or rect[3] <= 0:
+            return
+        for cell in self._cells(rect):
+            bucket = self.cells.get(cell)
+            if bucket is not None:
+                bucket.discard(item)
+                if not bucket:
+                    del self.cells[cell]
+
+    def query_point(self, pos:tuple[int,int]) -> set:
+        """
+        Get the items whose rect has the point
+
+        Parameters:
+            pos:tuple[int,int]
+        Returns:
+            set
+        """
+        bucket = self.cells.get((int(pos[0] // self.cell_size), int(pos[1] // self.cell_size)))
+        if not bucket:
+            return set()
+        x, y = pos
+        found = set()
+        for item in bucket:
+            rx, ry, rw, rh = self.rects[item]
+            if rx <= x < rx + rw and ry <= y < ry + rh:
+                found.add(item)
+        return found
+
+    def query_rect(self, rect:pg.Rect) -> set:
+        """
+        Get the items whose rect collides with a rect
+
+        Parameters:
+            rect:pg.Rect
+        Returns:
+            set
+        """
+        rect = pg.Rect(rect)
+        found = set()
+        for cell in self._cells(tuple(rect)):
+            for item in self.cells.get(cell, ()):
+                if item not in found and rect.colliderect(self.rects[item]):
+                    found.add(item)
+        return found
+
+    def clear(self):
+        self.cells.clear()
+        self.rects.clear()
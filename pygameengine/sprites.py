@@ -0,0 +1,215 @@
+"""
+A File designed to draw many sprites for the engine.
+
+- SpriteBatch: layered sprites drawn with one Surface.blits per layer, only the changed areas are redrawn;
+"""
+from .required import pg
+from .spatial import SpatialGrid
+from .objects import merge_rects
+
+class SpriteBatch:
+    """
+    Layered sprites, like pg.sprite.LayeredDirty, drawn with one Surface.blits per layer.
+
+    Sprites need image and rect, layer, visible and dirty are optional(pg.sprite.DirtySprite has them):
+    dirty 0 didn't change, 1 changed(redrawn once, then back to 0), 2 or no dirty always redrawn.
+
+    With a background, only the areas of the dirty sprites(old and new rect) are
+    restored and redrawn, with the parts of the other sprites inside them(found with a SpatialGrid).
+    Without a background everything is drawn every call, for screens filled every frame.
+    """
+    threshold:float = 0.5 # Dirty area over threshold * target area redraws everything
+    def __init__(self, background:pg.SurfaceType=None, cell_size:int=64):
+        """
+        Parameters:
+            background(Optional):pg.SurfaceType - Drawn under the sprites, with the size of the target
+            cell_size(Optional):int - Cells of the grid used to find the sprites in the dirty areas
+        """
+        self.layers:dict[int,dict] = {} # layer: {sprite: None}, in drawing order
+        self._layer_of:dict = {}
+        self._order:dict = {} # sprite: number, order inside the layer
+        self._count:int = 0
+        self._grid = SpatialGrid(cell_size) # Where each sprite was drawn
+        self._removed:list[pg.Rect,] = []
+        self._full:bool = True
+        self._background:pg.SurfaceType = background
+
+    @property
+    def background(self) -> pg.SurfaceType:
+        return self._background
+
+    @background.setter
+    def background(self, background:pg.SurfaceType):
+        self._background = background
+        self._full = True
+
+    def __len__(self) -> int:
+        return len(self._layer_of)
+
+    def __contains__(self, sprite) -> bool:
+        return sprite in self._layer_of
+
+    def __iter__(self):
+        return iter(self.sprites())
+
+    def sprites(self) -> list:
+        """
+        All the sprites, in drawing order
+        """
+        return [sprite for layer in sorted(self.layers) for sprite in self.layers[layer]]
+
+    def add(self, *sprites, layer:int=None):
+        """
+        Add sprites, on top of their layer
+
+        Parameters:
+            *sprites - Objects with image and rect
+            layer(Optional):int - Defaults to sprite.layer or 0
+        Returns:
+            None
+        """
+        for sprite in sprites:
+            if sprite in self._layer_of:
+                continue
+            n = getattr(sprite, 'layer', 0) if layer is None else layer
+            bucket = self.layers.get(n)
+            if bucket is None:
+                bucket = self.layers[n] = {}
+            bucket[sprite] = None
+            self._layer_of[sprite] = n
+            self._order[sprite] = self._count
+            self._count += 1
+            if getattr(sprite, 'dirty', 2) == 0:
+                sprite.dirty = 1 # Drawn in the next draw
+
+    def remove(self, *sprites):
+        """
+        Remove sprites, their area is restored in the next draw
+
+        Returns:
+            None
+        """
+        grid = self._grid
+        for sprite in sprites:
+            n = self._layer_of.pop(sprite, None)
+            if n is None:
+                continue
+            bucket = self.layers[n]
+            del bucket[sprite]
+            if not bucket:
+                del self.layers[n]
+            del self._order[sprite]
+            drawn = grid.rects.get(sprite)
+            if drawn is not None:
+                self._removed.append(pg.Rect(drawn))
+                grid.remove(sprite)
+
+    def change_layer(self, sprite, layer:int):
+        """
+        Move a sprite to the top of another layer
+        """
+        drawn = self._grid.rects.get(sprite)
+        self.remove(sprite)
+        self.add(sprite, layer=layer)
+        if drawn is not None:
+            self._removed.append(pg.Rect(drawn))
+
+    def clear(self):
+        self.layers.clear()
+        self._layer_of.clear()
+        self._order.clear()
+        self._grid.clear()
+        self._removed = []
+        self._full = True
+
+    def redraw(self):
+        """
+        Draw everything in the next draw
+        """
+        self._full = True
+
+    def draw(self, target:pg.SurfaceType) -> list[pg.Rect,]:
+        """
+        Draw the sprites that changed(or all of them)
+
+        Parameters:
+            target:pg.SurfaceType
+        Returns:
+            list[pg.Rect,] - Areas of the target that changed, for pg.display.update or Engine.markDirty
+        """
+        if self._full or self._background is None:
+            return self._draw_all(target)
+        grid = self._grid
+        drawn = grid.rects
+        areas = self._removed
+        self._removed = []
+        for bucket in self.layers.values():
+            for sprite in bucket:
+                dirty = getattr(sprite, 'dirty', 2) # Sprites without dirty always change
+                if not dirty:
+                    continue
+                old = drawn.get(sprite)
+                if old is not None:
+                    areas.append(pg.Rect(old))
+                if getattr(sprite, 'visible', 1):
+                    areas.append(sprite.rect.copy())
+                    grid.update(sprite, sprite.rect)
+                else:
+                    grid.remove(sprite)
+                if dirty == 1:
+                    sprite.dirty = 0
+        if not areas:
+            return []
+        bounds = target.get_rect()
+        areas = merge_rects([bounds.clip(area) for area in areas])
+        if sum(area.w * area.h for area in areas) > self.threshold * bounds.w * bounds.h:
+            return self._draw_all(target)
+
+        target.blits([(self._background, area, area) for area in areas], doreturn=False)
+        found:dict = {} # sprite: [areas it touches]
+        for area in areas:
+            for sprite in grid.query_rect(area):
+                touched = found.get(sprite)
+                if touched is None:
+                    found[sprite] = [area]
+                else:
+                    touched.append(area)
+        layer_of = self._layer_of
+        order = self._order
+        items = []
+        last = None
+        for sprite in sorted(found, key=lambda sprite: (layer_of[sprite], order[sprite])):
+            n = layer_of[sprite]
+            if n != last and items:
+                target.blits(items, doreturn=False)
+                items = []
+            last = n
+            rect = sprite.rect
+            image = sprite.image
+            # Only the parts inside the areas, the rest of the sprite is already right
+            for area in found[sprite]:
+                clip = area.clip(rect)
+                items.append((image, clip, clip.move(-rect.x, -rect.y)))
+        if items:
+            target.blits(items, doreturn=False)
+        return areas
+
+    def _draw_all(self, target:pg.SurfaceType) -> list[pg.Rect,]:
+        self._full = False
+        self._removed = []
+        if self._background is not None:
+            target.blit(self._background, (0, 0))
+        update = self._grid.update
+        remove = self._grid.remove
+        for n in sorted(self.layers):
+            items = []
+            for sprite in self.layers[n]:
+                if getattr(sprite, 'visible', 1):
+                    items.append((sprite.image, sprite.rect))
+                    update(sprite, sprite.rect)
+                else:
+                    remove(sprite)
+                if getattr(sprite, 'dirty', 0) == 1:
+                    sprite.dirty = 0
+            target.blits(items, doreturn=False)
+        return [target.get_rect()]
@@ -0,0 +1,354 @@
+"""
+A File designed to work with text rendering for the engine.
+
+- FontMetrics: advances and kerning of a font;
+- GlyphAtlas: glyphs of a font rendered once, texts composed with Surface.blits;
+- TextLayout: a long text broken in lines, word widths cached, only the changed part is broken again;
+"""
+import string
+from .required import pg
+
+DEFAULT_CHARSET = string.digits + string.ascii_letters + string.punctuation + ' '
+NUMERIC_CHARSET = string.digits + '.,:;-+%/ ' # Kerning precomputed for these pairs
+
+class FontMetrics:
+    """
+    Advance and kerning of the characters of a font.
+
+    Advances are measured once per character, kerning pairs are
+    precomputed for NUMERIC_CHARSET and measured on first use for the others.
+    """
+    font:pg.font.FontType
+    height:int
+    def __init__(self, font:pg.font.FontType, charset:str=DEFAULT_CHARSET):
+        self.font = font
+        self.height = font.get_height()
+        self.advances:dict[str,int] = {}
+        self.kerning:dict[tuple[str,str],int] = {}
+        for char in charset:
+            self.advance(char)
+        for a in NUMERIC_CHARSET:
+            for b in NUMERIC_CHARSET:
+                self.kern(a, b)
+
+    def advance(self, char:str) -> int:
+        x = self.advances.get(char)
+        if x is None:
+            x = self.advances[char] = self.font.size(char)[0]
+        return x
+
+    def kern(self, a:str, b:str) -> int:
+        """
+        Space between 2 characters, compared with their advances (usually 0 or negative)
+
+        Parameters:
+            a:str
+            b:str
+        Returns:
+            int
+        """
+        x = self.kerning.get((a, b))
+        if x is None:
+            x = self.kerning[(a, b)] = self.font.size(a + b)[0] - self.advance(a) - self.advance(b)
+        return x
+
+    def size(self, text:str) -> tuple[int,int]:
+        """
+        Same as font.size, using the cached metrics
+
+        Parameters:
+            text:str
+        Returns:
+            tuple[int,int]
+        """
+        w = 0
+        prev = None
+        for char in text:
+            if prev is not None:
+                w += self.kern(prev, char)
+            w += self.advance(char)
+            prev = char
+        return (w, self.height)
+
+class GlyphAtlas:
+    """
+    Glyphs of a font in one color, rendered once into a single surface.
+
+    Made for texts that change every frame (FPS, scores, values),
+    a text costs one Surface.blits call instead of a font.render.
+    """
+    font:pg.font.FontType
+    color:tuple[int,int,int]
+    metrics:FontMetrics
+    surface:pg.SurfaceType = None
+    def __init__(self, font:pg.font.FontType, color:tuple[int,int,int], metrics:FontMetrics=None, charset:str=DEFAULT_CHARSET):
+        """
+        Parameters:
+            font:pg.font.FontType
+            color:tuple[int,int,int]
+            metrics(Optional):FontMetrics - Shared between atlases of the same font
+            charset(Optional):str - Characters rendered now, others are added when used
+        """
+        self.font = font
+        self.color = tuple(color)
+        self.metrics = metrics if metrics is not None else FontMetrics(font, charset)
+        self.rects:dict[str,pg.Rect] = {}
+        self.surface = pg.Surface((0, self.metrics.height), pg.SRCALPHA)
+        self.add(charset)
+
+    def add(self, chars:str):
+        """
+        Render characters into the atlas, the surface grows to the right
+
+        Parameters:
+            chars:str
+        Returns:
+            None
+        """
+        glyphs = []
+        for char in dict.fromkeys(chars): # Unique, keeps order
+            if char not in self.rects:
+                glyphs.append((char, self.font.render(char, True, self.color)))
+        if not glyphs:
+            return
+        x = self.surface.get_width()
+        width = x + sum(glyph.get_width() for _, glyph in glyphs)
+        height = max([self.surface.get_height()] + [glyph.get_height() for _, glyph in glyphs])
+        surface = pg.Surface((width, height), pg.SRCALPHA)
+        surface.blit(self.surface, (0, 0), special_flags=pg.BLEND_RGBA_MAX) # Copy, no alpha blending
+        for char, glyph in glyphs:
+            surface.blit(glyph, (x, 0), special_flags=pg.BLEND_RGBA_MAX)
+            self.rects[char] = pg.Rect(x, 0, glyph.get_width(), glyph.get_height())
+            self.metrics.advance(char)
+            x += glyph.get_width()
+        self.surface = surface
+
+    def draw(self, target:pg.SurfaceType, position:tuple[int,int], text:str, alpha:int=255) -> pg.Rect:
+        """
+        Draw a text composed from the glyphs
+
+        Parameters:
+            target:pg.SurfaceType
+            position:tuple[int,int]
+            text:str
+            alpha(Optional):int
+        Returns:
+            pg.Rect
+        """
+        rects = self.rects
+        for char in text:
+            if char not in rects:
+                self.add(text)
+                break
+        advances = self.metrics.advances
+        kerning = self.metrics.kerning
+        kern = self.metrics.kern
+        surface = self.surface
+        x, y = position
+        blits = []
+        prev = None
+        for char in text:
+            if prev is not None:
+                k = kerning.get((prev, char))
+                x += kern(prev, char) if k is None else k
+            blits.append((surface, (x, y), rects[char]))
+            x += advances[char]
+            prev = char
+        self.surface.set_alpha(alpha)
+        target.blits(blits, False)
+        return pg.Rect(position[0], position[1], x - position[0], self.metrics.height)
+
+class TextLayout:
+    """
+    A text broken in lines that fit a width, made for long texts that grow(logs, dialogs).
+
+    '\n' always starts a new line. Word widths are measured once and kept, lines are
+    broken in one pass over the words; append() only breaks the last paragraph again
+    and a new width breaks the lines again without measuring.
+    """
+    font:pg.font.FontType
+    line_height:int
+    version:int = 0 # Changes with the lines
+    MAX_WORDS:int = 100000 # Cached word widths, cleared when over
+    def __init__(self, font:pg.font.FontType, width:int=None, text:str=''):
+        """
+        Parameters:
+            font:pg.font.FontType
+            width(Optional):int - None doesn't break the lines
+            text(Optional):str
+        """
+        self.font = font
+        self.line_height = font.size('W')[1]
+        self._width = width
+        self._space = font.size(' ')[0]
+        self._words:dict[str,int] = {}
+        self._text:str = ''
+        self.paragraphs:list[str,] = ['']
+        self.lines:list[str,] = ['']
+        self.widths:list[int,] = [0] # Width of each line, from the word widths
+        self._max_width:int = 0
+        self._counts:list[int,] = [1] # Lines of each paragraph
+        if text:
+            self.set_text(text)
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @width.setter
+    def width(self, width:int):
+        if width != self._width:
+            self._width = width
+            self._reflow(reuse=True)
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = '\n'.join(self.paragraphs)
+        return self._text
+
+    def word_width(self, word:str) -> int:
+        w = self._words.get(word)
+        if w is None:
+            if len(self._words) >= self.MAX_WORDS:
+                self._words.clear()
+            w = self._words[word] = self.font.size(word)[0]
+        return w
+
+    def _wrap(self, paragraph:str) -> tuple[list[str,],list[int,]]:
+        # Greedy, one pass: a word goes to the next line when it doesn't fit
+        measure = self.word_width
+        space = self._space
+        limit = self._width
+        lines = []
+        widths = []
+        current = []
+        w = 0
+        for word in paragraph.split(' '):
+            ww = measure(word)
+            if not current:
+                current.append(word)
+                w = ww
+            elif limit is not None and w + space + ww > limit:
+                current, w = self._close(current, w, lines, widths)
+                current.append(word)
+                w = ww if len(current) == 1 else w + space + ww
+            else:
+                current.append(word)
+                w += space + ww
+        self._close(current, w, lines, widths)
+        return lines, widths
+
+    def _close(self, words:list[str,], w:int, lines:list[str,], widths:list[int,]) -> tuple[list[str,],int]:
+        # Sums of word widths are a bit smaller than the real width(rounding, under 1 pixel per word),
+        # lines close to the limit are measured and their last words moved to the next line if needed
+        limit = self._width
+        carry = []
+        if limit is not None and len(words) > 1 and w + len(words) + 1 > limit:
+            size = self.font.size
+            while len(words) > 1 and size(' '.join(words))[0] > limit:
+                carry.insert(0, words.pop())
+            w = sum(map(self.word_width, words)) + self._space * (len(words) - 1)
+        lines.append(' '.join(words))
+        widths.append(w)
+        if not carry:
+            return [], 0
+        return carry, sum(map(self.word_width, carry)) + self._space * (len(carry) - 1)
+
+    @property
+    def max_width(self) -> int:
+        """
+        Width of the longest line, measured with the font
+        """
+        if self._max_width is None:
+            # Line widths are sums of word widths, the real width is a bit bigger(rounding, under 1 pixel per word),
+            # so only the lines that can be the longest are measured
+            size = self.font.size
+            best = 0
+            for w, i in sorted(zip(self.widths, range(len(self.lines))), reverse=True):
+                line = self.lines[i]
+                if w + line.count(' ') + 2 < best:
+                    break
+                best = max(best, size(line)[0])
+            self._max_width = best
+        return self._max_width
+
+    def _reflow(self, reuse:bool=False):
+        lines = []
+        widths = []
+        counts = []
+        wrap = self._wrap
+        limit = self._width
+        old_lines = self.lines
+        old_widths = self.widths
+        i = 0
+        for paragraph, count in zip(self.paragraphs, self._counts if reuse else [0] * len(self.paragraphs)):
+            # A paragraph in one line that still fits is kept(e.g. the lines of a log)
+            if count == 1 and (limit is None or old_widths[i] + paragraph.count(' ') + 2 <= limit):
+                lines.append(old_lines[i])
+                widths.append(old_widths[i])
+                counts.append(1)
+            else:
+                l, w = wrap(paragraph)
+                lines += l
+                widths += w
+                counts.append(len(l))
+            i += count
+        self.lines = lines
+        self.widths = widths
+        self._counts = counts
+        self._max_width = None
+        self.version += 1
+
+    def set_text(self, text:str):
+        """
+        Replace the text and break all the lines
+
+        Parameters:
+            text:str
+        Returns:
+            None
+        """
+        self.paragraphs = text.split('\n')
+        self._text = text
+        self._reflow()
+
+    def append(self, text:str):
+        """
+        Add text at the end, only the last paragraph is broken again
+
+        Parameters:
+            text:str
+        Returns:
+            None
+        """
+        if not text:
+            return
+        parts = text.split('\n')
+        self.paragraphs[-1] += parts[0]
+        self.paragraphs += parts[1:]
+        # Lines of the last paragraph are replaced
+        n = self._counts.pop()
+        if self._max_width is not None:
+            # Same bound of max_width, was one of the removed lines the longest?
+            gone = max(w + line.count(' ') + 2 for w, line in zip(self.widths[-n:], self.lines[-n:]))
+            if gone >= self._max_width:
+                self._max_width = None
+        del self.lines[-n:]
+        del self.widths[-n:]
+        wrap = self._wrap
+        added = 0
+        for paragraph in self.paragraphs[len(self._counts):]:
+            l, w = wrap(paragraph)
+            self.lines += l
+            self.widths += w
+            added += len(l)
+            self._counts.append(len(l))
+        if self._max_width is not None:
+            size = self.font.size
+            self._max_width = max(self._max_width, max(size(line)[0] for line in self.lines[-added:]))
+        self._text = None
+        self.version += 1
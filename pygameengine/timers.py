@@ -0,0 +1,172 @@
+"""
+A File designed to schedule things in time for the engine.
+
+- Timer: a delayed(or repeating) callback, also used as cooldown;
+- TimerWheel: hierarchical timer wheel, on a monotonic clock;
+"""
+import math, time
+
+class Timer:
+    """
+    Handle of a scheduled callback.
+
+    While pending it works as a cooldown(e.g. a button can't be clicked again),
+    cancel() removes it from the wheel.
+    """
+    __slots__ = ('deadline', 'callback', 'args', 'interval', '_wheel', '_bucket')
+    def __init__(self, wheel:'TimerWheel', deadline:float, callback:callable=None, args:tuple=(), interval:float=None):
+        self._wheel = wheel
+        self._bucket = None
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+
+    def __repr__(self) -> str:
+        return f'Timer(remaining={self.remaining():.3f}, interval={self.interval})'
+
+    @property
+    def pending(self) -> bool:
+        """
+        If the timer didn't fire(or repeats) and wasn't cancelled
+        """
+        return self._bucket is not None
+
+    def remaining(self) -> float:
+        """
+        Seconds until the timer fires, 0 when it isn't pending
+        """
+        if self._bucket is None:
+            return 0.0
+        return max(0.0, self.deadline - self._wheel.clock())
+
+    def cancel(self):
+        if self._bucket is not None:
+            self._bucket.pop(self, None)
+            self._bucket = None
+            self._wheel._count -= 1
+
+class TimerWheel:
+    """
+    Hierarchical timer wheel.
+
+    Time is cut in ticks of resolution seconds, the first wheel has one slot per tick,
+    each next wheel has one slot per turn of the previous one. Timers far in time wait in the
+    upper wheels and move down when their turn comes, so scheduling and cancelling don't depend
+    on the number of timers, and a timer costs nothing until it fires.
+
+    Time comes from a monotonic clock, not from frames, timers fire at the same time at any FPS.
+    """
+    def __init__(self, resolution:float=0.002, slots:int=64, levels:int=4, clock:callable=time.monotonic):
+        """
+        Parameters:
+            resolution(Optional):float - Seconds per tick, Defaults to 2ms
+            slots(Optional):int - Slots per wheel, Defaults to 64
+            levels(Optional):int - Number of wheels, Defaults to 4(64 * 2ms = 128ms, 8s, 8.7min, 9.3h)
+            clock(Optional):callable - Monotonic clock in seconds
+        """
+        self.resolution = resolution
+        self.slots = slots
+        self.levels = levels
+        self.clock = clock
+        self.wheels:list[list[dict]] = [[{} for _ in range(slots)] for _ in range(levels)]
+        self.tick:int = int(clock() / resolution)
+        self._count:int = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def schedule(self, delay:float, callback:callable=None, *args, interval:float=None) -> Timer:
+        """
+        Call callback(*args) after delay seconds, every interval seconds after that if given
+
+        Parameters:
+            delay:float
+            callback(Optional):callable - None for a cooldown
+            *args
+            interval(Optional):float
+        Returns:
+            Timer
+        """
+        timer = Timer(self, self.clock() + delay, callback, args, interval)
+        self._insert(timer)
+        self._count += 1
+        return timer
+
+    def _insert(self, timer:Timer):
+        slots = self.slots
+        deadline = max(math.ceil(timer.deadline / self.resolution), self.tick + 1) # Never early, late timers fire on the next tick
+        delta = deadline - self.tick
+        span = slots
+        level = 0
+        while delta >= span and level < self.levels - 1:
+            span *= slots
+            level += 1
+        if delta >= span: # Further than all the wheels, waits at the top and moves again
+            deadline = self.tick + span - 1
+        bucket = self.wheels[level][(deadline // (span // slots)) % slots]
+        bucket[timer] = None
+        timer._bucket = bucket
+
+    def _cascade(self, level:int, index:int):
+        wheel = self.wheels[level]
+        bucket = wheel[index]
+        if bucket:
+            wheel[index] = {}
+            for timer in bucket:
+                self._insert(timer)
+
+    def advance(self, now:float=None) -> int:
+        """
+        Fire the timers whose time has come
+
+        Parameters:
+            now(Optional):float - Defaults to the clock
+        Returns:
+            int - Number of timers fired
+        """
+        target = int((self.clock() if now is None else now) / self.resolution)
+        if not self._count:
+            self.tick = max(self.tick, target)
+            return 0
+        fired = 0
+        slots = self.slots
+        wheel = self.wheels[0]
+        while self.tick < target and self._count:
+            self.tick += 1
+            tick = self.tick
+            # Turn of the first wheel, timers of the upper wheels move down
+            level, span = 1, slots
+            while level < self.levels and tick % span == 0:
+                self._cascade(level, (tick // span) % slots)
+                level += 1
+                span *= slots
+            index = tick % slots
+            bucket = wheel[index]
+            if not bucket:
+                continue
+            wheel[index] = {}
+            for timer in list(bucket):
+                if timer._bucket is not bucket: # Cancelled by a callback of this tick
+                    continue
+                timer._bucket = None
+                self._count -= 1
+                fired += 1
+                if timer.interval is not None:
+                    timer.deadline += timer.interval
+                    if timer.deadline <= tick * self.resolution: # Late(e.g. window dragged), don't fire the missed ones
+                        timer.deadline = tick * self.resolution + timer.interval
+                    self._insert(timer)
+                    self._count += 1
+                if timer.callback is not None:
+                    timer.callback(*timer.args)
+        self.tick = max(self.tick, target)
+        return fired
+
+    def clear(self):
+        for wheel in self.wheels:
+            for bucket in wheel:
+                for timer in bucket:
+                    timer._bucket = None
+                bucket.clear()
+        self._count = 0
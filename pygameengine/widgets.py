@@ -12,14 +12,30 @@ A File designed to work in Widgets for the engine.
 """
 
 from .required import pg
-from .l_colors import reqColor
 from .objects import cfgtimes
+from .objects import color as reqColor
+from .timers import Timer
+from .text import TextLayout
+
+def freeze(value:any) -> any:
+    """
+    Convert a widget property to a value that can be compared with the next frame
+    (lists, vectors and rects to tuples, other objects are compared as they are)
+    """
+    t = type(value)
+    if t is list or t is pg.Vector2 or t is pg.Rect:
+        return tuple(value)
+    return value
 
 class Widget(pg.sprite.Sprite):
     """
     Base Widget Class
     
     Used for pre-setup widgets
+    
+    Widgets are retained: compose() builds the widget visual in one surface,
+    it is only called again when a property listed in _tracked changes,
+    so a widget that doesn't change is one blit per frame.
     """
     _id:str
     _type:str='widget'
@@ -37,6 +53,18 @@ class Widget(pg.sprite.Sprite):
     value:any
     
     _UpdateWhenDraw:bool = True
+    _order:int = 0
+    _batched:bool = True # Drawn by the engine with one Surface.blits
+    
+    # Events
+    events:tuple[int,] = () # Event types sent to handle_event, widgets with events only update while awake
+    focusable:bool = False # Gets the keyboard events when clicked
+    
+    # Retained Render
+    _tracked:tuple[str,] = ('value', 'text', 'colors', 'alpha', 'position')
+    _composed:pg.Surface = None
+    _composed_rect:pg.Rect = None
+    _composed_key:list = None
     def __init__(self, engine,id:str=None):
         """
         Initializes the widget.
@@ -47,27 +75,115 @@ class Widget(pg.sprite.Sprite):
         """
         super().__init__()
         self.engine = engine
-        self.engine.addWidget(self)
         
         if id in [' ','',None,'None']:
-            self._id = f'{self._type}{len(self.engine.widgets)}'
+            self._id = self.engine.widgets.new_id(self._type) # Unique, even after deletes
         else:
             self._id = id
+        self.engine.addWidget(self)
     
     def build_widget_display(self):
         pass
     
-    def cooldown_refresh(self):
-        pass
+    def state_key(self) -> list:
+        """
+        Values of the tracked properties, the widget is composed again when it changes
+        """
+        return [freeze(getattr(self, name, None)) for name in self._tracked]
     
-    def draw(self):
+    def compose(self) -> tuple[pg.Surface, pg.Rect]:
+        """
+        Build the widget visual
+        
+        Returns:
+            tuple[pg.Surface, pg.Rect]: The surface and where it goes on the screen
+        """
+        return self.image, self.rect
+    
+    def canvas(self, margin:int=0) -> tuple[pg.Surface, pg.Rect]:
+        """
+        Create a transparent surface with the size of the widget rect plus a margin(for borders)
+        
+        Returns:
+            tuple[pg.Surface, pg.Rect]: The surface and its rect on the screen
+        """
+        bounds = self.rect.inflate(margin*2, margin*2)
+        return pg.Surface(bounds.size, pg.SRCALPHA), bounds
+    
+    def invalidate(self):
+        """
+        Force the widget to be composed again in the next draw
+        """
+        self._composed = None
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Widgets with their own draw can't be batched by the engine
+        cls._batched = cls.draw is Widget.draw
+    
+    def render(self) -> tuple[pg.Surface, tuple[int,int]]:
+        """
+        Compose the widget if it changed and index it for hit-testing, without drawing it
+        
+        Returns:
+            tuple[pg.Surface, tuple[int,int]]: The surface and its position, an item for Surface.blits
+        """
         if self.image is None:
             self.build_widget_display() # First run of the draw, then create the draw object
-        if self._UpdateWhenDraw: self.update()
+        if self._composed is None or self.state_key() != self._composed_key:
+            self._composed, self._composed_rect = self.compose()
+            self._composed_key = self.state_key() # After compose, it may fix values(limits)
+        index = self.engine.widget_index
+        if index.update(self, self.hit_rect) and self not in self.engine.widgets: # Only changes the grid if it moved or resized
+            index.remove(self) # Deleted widgets drawn by hand don't get clicks
+        return self._composed, self._composed_rect.topleft
+    
+    def blit_composed(self) -> pg.Rect:
+        return self.engine.markDirty(self.engine.screen.blit(*self.render()))
+    
+    def draw(self):
+        self.engine._dispatch() # Widgets drawn by hand get the events too
+        self.blit_composed()
+        if self._UpdateWhenDraw and (not self.events or self in self.engine.dispatcher.awake):
+            self.update()
+    
+    @property
+    def hit_rect(self) -> pg.Rect:
+        """
+        Area of the screen used by the widget(with borders), indexed in render for hit-testing
+        """
+        return self._composed_rect if self._composed_rect is not None else self.rect
+    
+    def handle_event(self, event:pg.event.Event):
+        """
+        Called by the engine with the events of the types in self.events
+        """
+        pass
+    
+    def wake(self):
+        """
+        Update the widget every frame, until sleep is called
+        """
+        self.engine.dispatcher.wake(self)
+    
+    def sleep(self):
+        self.engine.dispatcher.sleep(self)
+    
+    def on_focus(self):
+        pass
+    
+    def on_blur(self):
+        pass
     
     def delete(self):
         self.engine.DeleteWidget(self._id)
     
+    def cooldown_refresh(self):
+        """
+        Deprecated, cooldowns are engine timers now(see PyGameEngine.after), kept for the subclasses that override it
+        """
+        pass
+    
     def update(self):
         self.cooldown_refresh()
     
@@ -79,13 +195,19 @@ class Button(Widget):
     will return a bool value(True/False)
     """
     _type:str = 'button'
+    _tracked:tuple[str,] = ('text', 'colors', 'alpha', 'position')
+    events:tuple[int,] = (pg.MOUSEBUTTONDOWN,)
     
+    click_time:float = cfgtimes.WD_BTN_CLICK_TIME
+    cooldown:Timer = None # Pending while the button can't be clicked again
+    click_time_counter:int = 0 # Deprecated, not used anymore: see cooldown
     
-    click_time:int = cfgtimes.WD_BTN_CLICK_TIME
-    click_time_counter:int = 0
+    on_click:callable = None
+    _clicked:object = None # InputState of the frame of the last click
+    _held:bool = False # Clicked again every click_time while held
     
     value:bool = False
-    def __init__(self,engine, position:pg.Vector2, font:int or pg.font.FontType, text:str, colors:list[reqColor,reqColor,],id:str=None,alpha:int=255): # type: ignore
+    def __init__(self,engine, position:pg.Vector2, font:int or pg.font.FontType, text:str, colors:list[reqColor,reqColor,],id:str=None,alpha:int=255, on_click:callable=None): # type: ignore
         """
         Button Widget, can be very useful
         
@@ -97,6 +219,7 @@ class Button(Widget):
             colors (list[reqColor,reqColor,]): The colors of the button
             id (str, optional): The id of the widget. Defaults to None.
             alpha (int, optional): The alpha of the button. Defaults to 255.
+            on_click (callable, optional): Called with the button when clicked. Defaults to None.
         """
         super().__init__(engine,id)
         self.position = position
@@ -104,6 +227,7 @@ class Button(Widget):
         self.text = text
         self.colors = colors
         self.alpha = alpha
+        self.on_click = on_click
         
     def build_widget_display(self):
         # First get the size of the text
@@ -119,32 +243,37 @@ class Button(Widget):
         self.engine.draw_text((0,0),self.text, self.font, self.colors[0], screen=self.image, alpha=self.alpha)
         self.rect = pg.Rect(*self.position,*self.size)
         
+    def handle_event(self, event:pg.event.Event):
+        if event.button == 1:
+            self._held = True
+            self.wake()
+            self._click()
+    
+    def _click(self):
+        if self.cooldown and self.cooldown.pending:
+            return
+        self.cooldown = self.engine.after(self.click_time)
+        self._clicked = self.engine.input
+        if self.on_click is not None:
+            self.on_click(self)
+    
     def update(self):
-        m_pos = self.engine.getMousePos()
-        if self.rect.collidepoint(m_pos):
-            m_press = self.engine.getMousePressed()
-            if m_press[0]:
-                if self.click_time_counter <= 0:
-                    self.click_time_counter = self.engine.TimeSys.s2f(self.click_time) # Reset Timer
-                    self.value = True
-                else:
-                    self.value = False
+        inp = self.engine.input
+        if self._held:
+            if inp.mouse_pressed[0] and self.hit_rect.collidepoint(inp.mouse_pos):
+                self._click()
             else:
-                self.value = False
-        else:
-            self.value = False
-        
-        return super().update()
-        
-    def cooldown_refresh(self):
-        if self.click_time_counter > 0:
-            self.click_time_counter -= 1
-            
-    def draw(self):
-        if self.image and self.rect:
-            self.engine.screen.blit(self.image, self.rect)
-        
-        return super().draw()
+                self._held = False
+        # True only in the frames of the clicks, the same if updated more times in a frame(Select buttons)
+        self.value = self._clicked is inp
+        super().update()
+        if not self.value and not self._held:
+            self.sleep()
+    
+    def compose(self) -> tuple[pg.Surface, pg.Rect]:
+        if self._composed_key is not None:
+            self.build_widget_display() # Tracked properties changed after the first build
+        return self.image, self.rect
     
 class Checkbox(Widget):
     """
@@ -157,9 +286,12 @@ class Checkbox(Widget):
     Checkbox!
     """
     _type:str = 'checkbox'
+    events:tuple[int,] = (pg.MOUSEBUTTONDOWN,)
     
-    click_time:int = cfgtimes.WD_CKBX_CLICK_TIME
-    click_time_counter:int = 0
+    click_time:float = cfgtimes.WD_CKBX_CLICK_TIME
+    cooldown:Timer = None
+    click_time_counter:int = 0 # Deprecated, not used anymore: see cooldown
+    _held:bool = False # Toggled again every click_time while held
     
     box_size:int # Default -> 1/4 of wid
     
@@ -202,29 +334,37 @@ class Checkbox(Widget):
         self.rect = pg.Rect(*self.position,*self.size)
         
     
-    def update(self):
-        m_pos = self.engine.getMousePos()
-        if self.rect.collidepoint(m_pos):
-            m_press = self.engine.getMousePressed()
-            if m_press[0]:
-                if self.click_time_counter <= 0:
-                    self.value = not self.value
-                    self.click_time_counter = self.engine.TimeSys.s2f(self.click_time) # Reset Timer
-        return super().update()
+    def handle_event(self, event:pg.event.Event):
+        if event.button == 1:
+            self._held = True
+            self.wake()
+            self._toggle()
     
-    def cooldown_refresh(self):
-        if self.click_time_counter > 0:
-            self.click_time_counter -= 1
-            
-    def draw(self):
-        if self.image and self.rect:
-            self.engine.screen.blit(self.image, self.rect)
-
-            # Draw box
-            c = self.colors[1] if not self.value else self.colors[2]
-            self.engine.draw_rect(self.rect.topleft, (self.box_size, self.size.y), c,border_width=(3 if len(self.colors) > 3 else 0),border_color= (self.colors[3] if len(self.colors) > 3 else (0,0,0)), alpha=self.alpha)
-        
-        return super().draw()
+    def _toggle(self):
+        if not (self.cooldown and self.cooldown.pending):
+            self.value = not self.value
+            self.cooldown = self.engine.after(self.click_time)
+    
+    def update(self):
+        inp = self.engine.input
+        if self._held and inp.mouse_pressed[0] and self.hit_rect.collidepoint(inp.mouse_pos):
+            self._toggle()
+        else:
+            self._held = False
+            self.sleep()
+        super().update()
+    
+    def compose(self) -> tuple[pg.Surface, pg.Rect]:
+        if self._composed_key is not None:
+            self.build_widget_display() # Tracked properties changed after the first build
+        surface, bounds = self.canvas(3)
+        x, y = self.rect.x - bounds.x, self.rect.y - bounds.y
+        surface.blit(self.image, (x, y))
+        
+        # Draw box
+        c = self.colors[1] if not self.value else self.colors[2]
+        self.engine.draw_rect((x, y), (self.box_size, self.size.y), c,border_width=(3 if len(self.colors) > 3 else 0),border_color= (self.colors[3] if len(self.colors) > 3 else (0,0,0)), alpha=self.alpha, screen=surface)
+        return surface, bounds
     
 class Slider(Widget):
     """
@@ -234,6 +374,8 @@ class Slider(Widget):
     collect from _value or value - Float
     """
     _type:str = 'slider'
+    events:tuple[int,] = (pg.MOUSEBUTTONDOWN, pg.MOUSEMOTION)
+    _tracked:tuple[str,] = ('currentPosition', 'fill_passed', 'colors', 'alpha', 'position')
     
     circle:pg.Rect = None
     ball_size:int = 10
@@ -282,20 +424,24 @@ class Slider(Widget):
             self.currentPosition = [self.rect.x + self._value * (self.rect.width - self.ball_size), self.rect.y - self.ball_size//4] # Fixed.
         else:
             self.currentPosition = [self.rect.x + self.ball_size//2, self.rect.y - self.ball_size//4]
-    
-    def update(self):
-        if self.circle:
-            m_pos = self.engine.getMousePos()
-            if self.circle.collidepoint(m_pos):
-                m_press = self.engine.getMousePressed()
-                if m_press[0]:
-                    self.currentPosition[0] = m_pos[0] - self.circle.width/2
-                    # Limit X Right
-                    if self.currentPosition[0] > self.rect.x + self.rect.width - self.ball_size/2:
-                        self.currentPosition[0] = self.rect.x + self.rect.width - self.ball_size/2
-                    elif self.currentPosition[0] < self.rect.x - self.ball_size/2:# Limit X Left
-                        self.currentPosition[0] = self.rect.x - self.ball_size/2
-                    
+        self.calc_value()
+    
+    def handle_event(self, event:pg.event.Event):
+        # Press anywhere on the slider, then drag(the slider keeps the mouse until released)
+        if event.type == pg.MOUSEBUTTONDOWN:
+            if event.button != 1:
+                return
+        elif not (event.buttons[0] and self.engine.dispatcher.capture is self):
+            return
+        self.currentPosition[0] = event.pos[0] - self.ball_size
+        # Limit X Right
+        if self.currentPosition[0] > self.rect.x + self.rect.width - self.ball_size/2:
+            self.currentPosition[0] = self.rect.x + self.rect.width - self.ball_size/2
+        elif self.currentPosition[0] < self.rect.x - self.ball_size/2:# Limit X Left
+            self.currentPosition[0] = self.rect.x - self.ball_size/2
+        self.calc_value()
+    
+    def calc_value(self):
         # Calculate the value (float beetween 0 and 1)
         
         # Get the value beetween 0 and max size
@@ -305,24 +451,21 @@ class Slider(Widget):
         if v < 0: v = 0
         elif v > 1: v = 1
         self.value = round(v,2)
-                        
-                    
-        return super().update()
     
-    def draw(self):
+    def compose(self) -> tuple[pg.Surface, pg.Rect]:
+        self.circle = pg.Rect(*self.currentPosition, self.ball_size*2, self.ball_size*2)
+        bounds = self.rect.union(self.circle) # The ball goes out of the bar
+        surface = pg.Surface(bounds.size, pg.SRCALPHA)
+        x, y = self.rect.x - bounds.x, self.rect.y - bounds.y
+        surface.blit(self.image, (x, y))
         
-        if self.image and self.rect:
-            self.engine.screen.blit(self.image, self.rect)
-            
-            # Fill passed
-            
-            if self.fill_passed:
-                w = self.currentPosition[0]-self.rect.x
-                self.engine.draw_rect((self.rect.x, self.rect.y), (0 if w < 0 else w+self.ball_size/2, self.rect.height), self.colors[0] if len(self.colors) < 4 else self.colors[3], alpha=self.alpha)
-            
-            self.circle = self.engine.draw_circle(self.currentPosition,self.ball_size, self.colors[0], alpha=self.alpha)
+        # Fill passed
+        if self.fill_passed:
+            w = self.currentPosition[0]-self.rect.x
+            self.engine.draw_rect((x, y), (0 if w < 0 else w+self.ball_size/2, self.rect.height), self.colors[0] if len(self.colors) < 4 else self.colors[3], alpha=self.alpha, screen=surface)
         
-        return super().draw()
+        self.engine.draw_circle((self.currentPosition[0] - bounds.x, self.currentPosition[1] - bounds.y),self.ball_size, self.colors[0], alpha=self.alpha, screen=surface)
+        return surface, bounds
 
 class Select(Widget):
     """
@@ -331,6 +474,8 @@ class Select(Widget):
     It's like choose a item, Left or Right.
     """
     _type:str = 'select'
+    _tracked:tuple[str,] = ('value', 'items', 'colors', 'alpha', 'position')
+    _UpdateWhenDraw:bool = False # Changed by the buttons
     
     leftButton:Button = None
     rightButton:Button = None
@@ -369,8 +514,8 @@ class Select(Widget):
     def build_widget_display(self):
         self.size = self.font.size(self.items[self.value])
         
-        self.leftButton = Button(self.engine, (self.position[0],self.position[1]), self.font, '<', self.colors, alpha=self.alpha, id=f'{self._id}_left')
-        self.rightButton = Button(self.engine, (self.position[0],self.position[1]), self.font, '>', self.colors, alpha=self.alpha, id=f'{self._id}_right')
+        self.leftButton = Button(self.engine, (self.position[0],self.position[1]), self.font, '<', self.colors, alpha=self.alpha, id=f'{self._id}_left', on_click=self.previous)
+        self.rightButton = Button(self.engine, (self.position[0],self.position[1]), self.font, '>', self.colors, alpha=self.alpha, id=f'{self._id}_right', on_click=self.next)
         
         self.leftButton.click_time = self.button_click_time
         self.rightButton.click_time = self.button_click_time
@@ -380,22 +525,27 @@ class Select(Widget):
         self.image = pg.Surface(self.size, pg.SRCALPHA)
         
     
-    def update(self):
-        if self.leftButton and self.rightButton:
-            if self.leftButton.value:
-                self.value -= 1
-                if self.value < 0:
-                    self.value = len(self.items) - 1
-                
-            if self.rightButton.value:
-                self.value += 1
-                if self.value >= len(self.items):
-                    self.value = 0
-                
-            
-            self.size = self.font.size(str(self.items[self.value]))
-            self.rect = pg.Rect(*self.position,*self.size)
-        return super().update()
+    def previous(self, button:Button=None):
+        self.value -= 1
+        if self.value < 0:
+            self.value = len(self.items) - 1
+        self.resize()
+    
+    def next(self, button:Button=None):
+        self.value += 1
+        if self.value >= len(self.items):
+            self.value = 0
+        self.resize()
+    
+    def resize(self):
+        self.size = self.font.size(str(self.items[self.value]))
+        self.rect = pg.Rect(*self.position,*self.size)
+    
+    def compose(self) -> tuple[pg.Surface, pg.Rect]:
+        self.resize() # Value may be changed from outside
+        surface, bounds = self.canvas(3)
+        self.engine.draw_text((self.rect.left - bounds.x,self.rect.top - bounds.y),str(self.items[self.value]), self.font, self.colors[0],bgColor=self.colors[1],border_width=3,border_color=self.colors[2], alpha=self.alpha, screen=surface)
+        return surface, bounds
     
     def draw(self):
         
@@ -403,7 +553,6 @@ class Select(Widget):
             self.leftButton.rect.right = self.rect.left - 5
             self.rightButton.rect.left = self.rect.right + 5
             
-            self.engine.draw_text((self.rect.left,self.rect.top),str(self.items[self.value]), self.font, self.colors[0],bgColor=self.colors[1],border_width=3,border_color=self.colors[2], alpha=self.alpha)
             # Draw buttons independant of list widgets // Fix
             self.leftButton.draw()
             self.rightButton.draw()        
@@ -414,11 +563,21 @@ class Longtext(Widget):
     LongText Widget.
     
     It's like a textarea.
+    
+    The lines are kept by a TextLayout(append() only breaks the new text),
+    only the lines that fit in the widget are drawn, scroll with the mouse wheel or scroll_to.
     """
     _type:str = 'longtext'
+    _tracked:tuple[str,] = ('_version', 'colors', 'alpha', 'position', 'size', 'scroll')
+    _UpdateWhenDraw:bool = False # No input
+    events:tuple[int,] = (pg.MOUSEWHEEL,)
     
-    lines:list[str,] = []
+    layout:TextLayout = None
     auto_size:bool = False
+    scroll:int = 0 # First line shown
+    follow:bool = True # Keep showing the last line when text is appended while scrolled to the end
+    wheel_lines:int = 3
+    _to_end:bool = False
     
     def __init__(self, engine, position: [int,int], font: int or pg.font.FontType,text:str,colors: list[reqColor,],size: [int, int] = None,id: str = None, alpha: int = 255): # type: ignore
         super().__init__(engine, id)
@@ -430,60 +589,109 @@ class Longtext(Widget):
             self.size = (0,0)
         else:
             self.size = size
+        self.layout = TextLayout(self.font)
         self.text = text
         self.alpha = alpha
     
+    @property
+    def text(self) -> str:
+        return self.layout.text if self.layout is not None else ''
+    
+    @text.setter
+    def text(self, text:str):
+        self.layout.set_text(str(text))
+    
+    @property
+    def lines(self) -> list[str,]:
+        return self.layout.lines
+    
+    @property
+    def _version(self) -> int:
+        return self.layout.version
+    
+    def append(self, text:str):
+        """
+        Add text at the end(e.g. a new line of a log), faster than changing text
+        """
+        if self.follow and self.scroll >= self.max_scroll:
+            self._to_end = True
+        self.layout.append(str(text))
+    
     def get_lines(self) -> dict:
         """
         - Get the lines of the text;
         - Break the lines when it's too long;
         """
-        lines = {}
-        current_line = ''
-        self.text = self.text.replace('\n',' ')
-        for word in self.text.split(' '):
-            if pg.font.Font.size(self.font, current_line + word)[0] > self.engine.screen.get_size()[0] - self.position[0]:
-                lines[len(lines) + 1] = current_line
-                current_line = word + ' '
-            else:
-                current_line += word + ' '
-        lines[len(lines) + 1] = current_line.strip()
-        return lines
-
+        self.layout.width = self.wrap_width()
+        return {i + 1: line for i, line in enumerate(self.layout.lines)}
+    
+    def wrap_width(self) -> int:
+        # Auto size breaks on the border of the screen
+        if self.auto_size:
+            return self.engine.screen.get_size()[0] - self.position[0]
+        return self.size[0]
+    
+    @property
+    def visible_lines(self) -> int:
+        """
+        Lines that fit entirely in the widget
+        """
+        return max(1, int(self.size[1]) // self.layout.line_height)
+    
+    @property
+    def max_scroll(self) -> int:
+        return max(0, len(self.layout) - self.visible_lines)
+    
+    def scroll_to(self, line:int):
+        self.scroll = max(0, min(int(line), self.max_scroll))
+    
+    def scroll_by(self, lines:int):
+        self.scroll_to(self.scroll + lines)
+    
+    def handle_event(self, event:pg.event.Event):
+        self.scroll_by(-event.y * self.wheel_lines)
     
     def build_widget_display(self):
         """
         Basically this will limit the text to only show to the border of screen, and if this is too long, it will break to the next line, and will get the line with the biggest width as self.size[0]
-        and the total height of lines as self.size[1]
+        and the total height of lines as self.size[1](up to the bottom of the screen, then it scrolls)
         
         but only if self.auto_size is True
-        else it will get the size of the text and bypass the screen size
+        else the lines are broken at self.size[0]
         """
+        layout = self.layout
+        layout.width = self.wrap_width()
+        line_height = layout.line_height
         if self.auto_size:
-            lines = self.get_lines()
-            
-            max_size = 0
-            for line in lines.values():
-                if pg.font.Font.size(self.font, line)[0] > max_size:
-                    max_size = pg.font.Font.size(self.font, line)[0]
-            
-            self.text = [line for line in lines.values()]
-            self.size = (max_size, (len(self.text) * pg.font.Font.size(self.font, 'W')[1])+5)
+            height = len(layout) * line_height + 5
+            limit = max(line_height + 5, self.engine.screen.get_size()[1] - int(self.position[1]))
+            self.size = (layout.max_width, min(height, limit))
+        if self._to_end:
+            self._to_end = False
+            self.scroll = self.max_scroll
+        else:
+            self.scroll_to(self.scroll)
             
         self.image = pg.Surface(self.size, pg.SRCALPHA)
         self.rect = pg.Rect(*self.position,*self.size)
         if len(self.colors) > 1:
             self.engine.draw_rect((0,0), self.size, self.colors[1], border_width=3 if len(self.colors) > 2 else 0, border_color=self.colors[2] if len(self.colors) > 2 else None,alpha=self.alpha, screen=self.image)
-        for i, line in enumerate(self.text):
-            self.engine.draw_text((0,(i*pg.font.Font.size(self.font, 'W')[1])),line, self.font, self.colors[0],alpha=self.alpha, screen=self.image)
-            
-    def draw(self):
-        if self.image and self.rect:
-            self.engine.screen.blit(self.image, self.rect)
-        return super().draw()
+        # Only the visible lines(the last one may be cut)
+        first = self.scroll
+        count = -(-int(self.size[1]) // line_height)
+        for i, line in enumerate(layout.lines[first:first + count]):
+            if line:
+                self.engine.draw_text((0,(i*line_height)),line, self.font, self.colors[0],alpha=self.alpha, screen=self.image)
+    
+    def compose(self) -> tuple[pg.Surface, pg.Rect]:
+        if self._composed_key is not None:
+            self.build_widget_display() # Tracked properties changed after the first build
+        return self.image, self.rect
     
 class Progressbar(Widget):
     _type:str = 'progressbar'
+    _tracked:tuple[str,] = ('value', 'text', 'colors', 'position', 'size', 'font')
+    _UpdateWhenDraw:bool = False # No input
     
     colors:list[reqColor,reqColor,reqColor,] = []
     text:str = None
@@ -512,40 +720,46 @@ class Progressbar(Widget):
         self.rect = pg.Rect(*self.position,*self.size)
         self.image = pg.Surface(self.size, pg.SRCALPHA)
         
-    def draw(self):
-        if self.image and self.rect:
-            if self.value < 0:
-                self.value = 0
-            elif self.value > 1:
-                self.value = 1
-            # Background with border
-            self.engine.draw_rect(self.rect.topleft, self.rect.size, self.colors[1], border_width=3, border_color=self.colors[2])
-            
-            # Fill bar
-            self.engine.draw_rect(self.rect.topleft, (self.rect.width * self.value, self.rect.height), self.colors[0])
-            
-            if self.text and (self.font and len(self.colors) > 3):
-                self.engine.draw_text((self.rect.left+1, self.rect.top+1),str(self.text), self.font, self.colors[3])
-        return super().draw()
+    def compose(self) -> tuple[pg.Surface, pg.Rect]:
+        if self.value < 0:
+            self.value = 0
+        elif self.value > 1:
+            self.value = 1
+        self.rect = pg.Rect(*self.position,*self.size)
+        surface, bounds = self.canvas(3)
+        x, y = self.rect.x - bounds.x, self.rect.y - bounds.y
+        # Background with border
+        self.engine.draw_rect((x, y), self.rect.size, self.colors[1], border_width=3, border_color=self.colors[2], screen=surface)
+        
+        # Fill bar
+        self.engine.draw_rect((x, y), (self.rect.width * self.value, self.rect.height), self.colors[0], screen=surface)
+        
+        if self.text and (self.font and len(self.colors) > 3):
+            self.engine.draw_text((x+1, y+1),str(self.text), self.font, self.colors[3], screen=surface)
+        return surface, bounds
     
 class Textbox(Widget):
     _type:str = 'textbox'
+    _tracked:tuple[str,] = ('text', 'active', 'colors', 'alpha', 'rect')
+    events:tuple[int,] = (pg.MOUSEBUTTONDOWN, pg.KEYDOWN)
+    focusable:bool = True
     
     colors:list[reqColor,reqColor,reqColor,] = []
-    text:str = None
+    _text:str = None
     font:pg.font.FontType = None
     height:int = 0
     max_width:int = 0
     active = False
     
-    del_press_time:int = cfgtimes.WD_TXBX_DEL_TIME
-    del_press_counter:int = 0
+    del_press_time:float = cfgtimes.WD_TXBX_DEL_TIME # Repeat of backspace when held
+    del_repeat:Timer = None
+    del_press_counter:int = 0 # Deprecated, not used anymore: see del_repeat
     
-    key_press_time:int = cfgtimes.WD_TXBX_KEYP_TIME
-    key_press_counter:int = 0
-    
-    click_time:int = cfgtimes.WD_TXBX_CLICK_TIME
-    click_counter:int = 0
+    # Deprecated, not used anymore: typing comes from the KEYDOWN events(with the OS key repeat) and focus from the dispatcher
+    key_press_time:float = cfgtimes.WD_TXBX_KEYP_TIME
+    key_press_counter:int = 0 # Deprecated
+    click_time:float = cfgtimes.WD_TXBX_CLICK_TIME
+    click_counter:int = 0 # Deprecated
     
     blacklist = [
         pg.K_BACKSPACE,
@@ -576,73 +790,62 @@ class Textbox(Widget):
         self.font:pg.font.FontType = self.engine._findFont(font)
         self.alpha:int = alpha
         
+    @property
+    def text(self) -> str:
+        return self._text
+    
+    @text.setter
+    def text(self, text:str):
+        self._text = text
+        self.value = text # Up to date without waiting for the next draw
+    
     def build_widget_display(self):
         self.max_width = self.engine.screen.get_width() - self.position[0]
         self.image = pg.Surface((0,0))
         self.rect = pg.Rect(*self.position,self.max_width,self.height)
         
-    def update(self):
-        # Update Size
+    def resize(self):
         size = self.font.size(self.text)
         w,h = size[0]+5,size[1]
         if h > self.height:
             self.height = h+2
         self.rect.size = (self.font.size('WW')[0] if w < self.font.size('WW')[0] else w,h+2)
-        
-        # Update Value
-        self.value = self.text
-        
-        # Get mouse and update if is active or no
-        # m_pos = self.engine.getMousePos()
-        # if self.rect.collidepoint(m_pos):
-        #     if self.engine.getMousePressed()[0]:
-        #         if self.key_press_counter <= 0:
-        #             self.key_press_counter = self.engine.TimeSys.s2f(self.key_press_time) # Reset Timer
-        #             self.active = True
-        #         else:
-        #             self.active = False
-        if self.engine.getMousePressed()[0]:
-            if self.click_counter <= 0:
-                m_pos = self.engine.getMousePos()
-                if self.rect.collidepoint(m_pos):
-                    if not self.active:
-                        self.click_counter = self.engine.TimeSys.s2f(self.click_time) # Reset Timer
-                        self.active = True
-                else:
-                    self.active = False
-        
-        if self.active:
-            if self.key_press_counter <= 0 or self.del_press_counter <= 0:    
-                keys:pg.key.ScancodeWrapper = self.engine.getKeys() # Get Keys pressed
-                if keys[pg.K_BACKSPACE] and self.del_press_counter <= 0:
-                    self.text = self.text[:-1] # Remove last character
-                    self.del_press_counter = self.engine.TimeSys.s2f(self.del_press_time)
-                elif keys[pg.K_RETURN] and self.key_press_counter <= 0:
-                    self.active = False
-                    self.key_press_counter = self.engine.TimeSys.s2f(self.key_press_time)
-                elif self.key_press_counter <= 0:
-                    for ev in self.engine.events:
-                        if ev.type == pg.KEYDOWN:
-                            if not (ev.key in self.blacklist):
-                                self.text += ev.unicode
-                            self.key_press_counter = self.engine.TimeSys.s2f(self.key_press_time)
-                            
-        
-        
-        return super().update()
     
-    def cooldown_refresh(self):
-        if self.key_press_counter > 0:
-            self.key_press_counter -= 1
-        if self.click_counter > 0:
-            self.click_counter -= 1
-        if self.del_press_counter > 0:
-            self.del_press_counter -= 1
-        return super().cooldown_refresh()
-    
-    def draw(self):
-        if self.image:
-            self.engine.draw_rect(self.rect.topleft, self.rect.size, self.colors[0] if not self.active else self.colors[1], border_width=3 if len(self.colors) > 3 else 0, border_color=self.colors[2] if len(self.colors) > 3 else None,alpha=self.alpha)
-            self.engine.draw_text((self.rect.left+2.5, self.rect.top+1),self.text, self.font, self.colors[2],alpha=self.alpha)
-        return super().draw()
+    def handle_event(self, event:pg.event.Event):
+        if event.type == pg.KEYDOWN:
+            if event.key == pg.K_BACKSPACE:
+                self._backspace()
+            elif event.key == pg.K_RETURN:
+                self.engine.dispatcher.set_focus(None)
+            elif not (event.key in self.blacklist):
+                self.text += event.unicode
+    
+    def _backspace(self):
+        # Remove the last character, again every del_press_time while backspace is held
+        self.text = self.text[:-1]
+        if self.del_repeat is not None:
+            self.del_repeat.cancel()
+        self.del_repeat = self.engine.after(self.del_press_time, self._repeat_delete)
+    
+    def _repeat_delete(self):
+        self.del_repeat = None
+        if self.active and self.engine.input.keys[pg.K_BACKSPACE]:
+            self._backspace()
+    
+    def on_focus(self):
+        self.active = True
+    
+    def on_blur(self):
+        self.active = False
+        if self.del_repeat is not None:
+            self.del_repeat.cancel()
+            self.del_repeat = None
+    
+    def compose(self) -> tuple[pg.Surface, pg.Rect]:
+        self.resize() # Text may be changed from outside
+        surface, bounds = self.canvas(3)
+        x, y = self.rect.x - bounds.x, self.rect.y - bounds.y
+        self.engine.draw_rect((x, y), self.rect.size, self.colors[0] if not self.active else self.colors[1], border_width=3 if len(self.colors) > 3 else 0, border_color=self.colors[2] if len(self.colors) > 3 else None,alpha=self.alpha, screen=surface)
+        self.engine.draw_text((x+2.5, y+1),self.text, self.font, self.colors[2],alpha=self.alpha, screen=surface)
+        return surface, bounds
         
\ No newline at end of file
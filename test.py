@@ -18,7 +18,7 @@ arial36 = pge.createSysFont('Arial', 36)
 Button:pyge.Button = pge.create_widget(pyge.Button, (15, 100), arial24, 'Im a Button!', [pge.Colors.DARKGRAY, pge.Colors.WHITE, pge.Colors.LIGHTGRAY], id='button1')
 Check = pge.create_widget('Checkbox', (190,100), arial24, 'Im a Checkbox!', [pge.Colors.WHITE, pge.Colors.RED, pge.Colors.GREEN, pge.Colors.DARKGRAY], id='checkbox1')
 Slider = pge.create_widget('Slider', (15, 170), (300, 20), [pge.Colors.WHITE, pge.Colors.DARKGRAY, pge.Colors.LIGHTGRAY, pge.Colors.DARKPINK], value=.5, id='slider1')
-Select = pge.create_widget('Select', (25, 250), arial24, [pge.Colors.HOTPING, pge.Colors.DARKGRAY, pge.Colors.LIGHTGRAY], items=['480x360', '640x480', '800x600', '1024x768', '1280x720', '1366x768', '1440x900', '1600x900', '1680x1050', '1920x1200','1920x1080'],textBg=True)
+Select = pge.create_widget('Select', (25, 250), arial24, [pge.Colors.HOTPINK, pge.Colors.DARKGRAY, pge.Colors.LIGHTGRAY], items=['480x360', '640x480', '800x600', '1024x768', '1280x720', '1366x768', '1440x900', '1600x900', '1680x1050', '1920x1200','1920x1080'],textBg=True)
 ProgressBar = pge.create_widget('ProgressBar', (15, 500), (300, 20), [pge.Colors.RED, pge.Colors.BROWN, pge.Colors.BROWN, pge.Colors.WHITE],text='?/?', font=arial16, value=.5)
 TextBox = pyge.Textbox(pge, (10, 600), 20, [pge.Colors.DARKGRAY, pge.Colors.LIGHTBLUE,pge.Colors.WHITE, pge.Colors.LIGHTGRAY], arial16, 'Im a textbox!', id='textbox1')
 
@@ -35,7 +35,7 @@ pge.loadIcon()
 while True:
     # Draw a text
     if Button.value:
-        pge.draw_text((15, 15),f'Button Pressed, Delay Counter(Frames): {Button.click_time_counter}', arial24, pge.Colors.WHITE)
+        pge.draw_text((15, 15),f'Button Pressed, Cooldown: {Button.cooldown.remaining():.2f}s', arial24, pge.Colors.WHITE)
     if Check.value:
         pge.draw_text( (15, 36), 'Checkbox Checked', arial24, pge.Colors.WHITE)
         
@@ -59,7 +59,7 @@ while True:
                 ProgressBar.value -= 0.05
             
     # Update the screen
-    pge.draw_text((0,0), f'FPS: {int(pge.getFPS())}', arial16, pge.Colors.WHITE)
+    pge.draw_text_fast((0,0), f'FPS: {int(pge.getFPS())}', arial16, pge.Colors.WHITE)
     pge.draw_widgets()
     pge.screen.blit(pge.icon.surf, (896, 592))
     pge.update()